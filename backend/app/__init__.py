@@ -74,6 +74,10 @@ def create_app(config_class=Config):
     
     migrate.init_app(app, db)
     
+    # Listing caches are cleared on commit wherever the write comes from
+    from app.services.listing_cache import register_invalidation
+    register_invalidation()
+    
     # Test route
     @app.route('/api/test')
     def test():
@@ -2,5 +2,8 @@ from app.extensions import db
 from app.models.user import User
 from app.models.resource import Resource
 from app.models.bookmark import Bookmark
+from app.models.external_item import ExternalItem
+from app.models.chat_session import ChatSession, ChatTurn
+from app.models.user_recommendation import UserRecommendation
 
-__all__ = ['db', 'User', 'Resource', 'Bookmark'] 
\ No newline at end of file
+__all__ = ['db', 'User', 'Resource', 'Bookmark', 'ExternalItem', 'ChatSession', 'ChatTurn', 'UserRecommendation'] 
\ No newline at end of file
@@ -2,6 +2,12 @@ from app.extensions import db
 from datetime import datetime
 
 class Bookmark(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'resource_id', name='uq_bookmark_user_id_resource_id'),
+        # A user's bookmarks, newest first
+        db.Index('ix_bookmark_user_id_created_at', 'user_id', 'created_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
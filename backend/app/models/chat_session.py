@@ -0,0 +1,55 @@
+from app.extensions import db
+from datetime import datetime
+
+class ChatSession(db.Model):
+    """A conversation with the AI assistant, kept server side so clients only send new messages."""
+    __tablename__ = 'chat_session'
+    __table_args__ = (
+        db.Index('ix_chat_session_user_id_updated_at', 'user_id', 'updated_at'),
+    )
+    
+    id = db.Column(db.String(32), primary_key=True)  # random hex, doubles as the client handle
+    title = db.Column(db.String(200))
+    turn_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Foreign Keys
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'turn_count': self.turn_count,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+    
+    def __repr__(self):
+        return f'<ChatSession {self.id}>'
+
+class ChatTurn(db.Model):
+    """One message of a chat session, as plain text."""
+    __tablename__ = 'chat_turn'
+    __table_args__ = (
+        db.Index('ix_chat_turn_session_id_id', 'session_id', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    role = db.Column(db.String(10), nullable=False)  # 'user' or 'assistant'
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Foreign Keys
+    session_id = db.Column(db.String(32), db.ForeignKey('chat_session.id'), nullable=False)
+    
+    def to_dict(self):
+        return {
+            'role': self.role,
+            'content': self.content,
+            'created_at': self.created_at.isoformat()
+        }
+    
+    def __repr__(self):
+        return f'<ChatTurn {self.id}>'
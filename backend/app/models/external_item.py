@@ -0,0 +1,28 @@
+from app.extensions import db
+from datetime import datetime
+import json
+
+class ExternalItem(db.Model):
+    """Local copy of a GitHub repository or arXiv paper we have fetched before."""
+    __tablename__ = 'external_item'
+    __table_args__ = (
+        db.UniqueConstraint('source', 'external_id', name='uq_external_item_source_external_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(20), nullable=False)  # 'github' or 'arxiv'
+    external_id = db.Column(db.String(200), nullable=False)
+    title = db.Column(db.String(500), nullable=False)
+    description = db.Column(db.Text)
+    url = db.Column(db.String(500))
+    published_at = db.Column(db.DateTime)
+    stars = db.Column(db.Integer)  # GitHub only, mirror hits are ordered by it like live results
+    # The item exactly as the search routes serve it, as JSON
+    data = db.Column(db.Text, nullable=False)
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return json.loads(self.data)
+    
+    def __repr__(self):
+        return f'<ExternalItem {self.source}:{self.external_id}>'
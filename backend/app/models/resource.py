@@ -2,10 +2,16 @@ from app import db
 from datetime import datetime
 
 class Resource(db.Model):
+    __table_args__ = (
+        # Approved/pending listings, optionally by category, newest first
+        db.Index('ix_resource_is_approved_created_at', 'is_approved', 'created_at'),
+        db.Index('ix_resource_is_approved_category_created_at', 'is_approved', 'category', 'created_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    url = db.Column(db.String(500), nullable=False)
+    url = db.Column(db.String(500), nullable=False, index=True)
     category = db.Column(db.String(50))
     is_approved = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
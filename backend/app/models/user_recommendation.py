@@ -0,0 +1,15 @@
+from app.extensions import db
+from datetime import datetime
+
+class UserRecommendation(db.Model):
+    """Last AI recommendations computed for a user and the bookmark set they were based on."""
+    __tablename__ = 'user_recommendation'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    # Hash of the bookmarked resource ids the content was generated from
+    fingerprint = db.Column(db.String(40), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<UserRecommendation {self.user_id}>'
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Bookmark, Resource, db, User
+from app.services.listing_cache import bookmark_counts
+from app.utils.pagination import InvalidCursor, keyset_page, page_count
+from app.utils.serializers import bookmark_serializer
 
 bookmarks_bp = Blueprint('bookmarks', __name__)
 
@@ -23,17 +26,33 @@ def get_bookmarks():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 12, type=int)
         
-        # Query with pagination
-        bookmarks = Bookmark.query.filter_by(user_id=user_id)\
+        query = Bookmark.query.filter_by(user_id=user_id)
+        total = bookmark_counts.count(user_id, None, query)
+        
+        # Keyset page when the client passes ?cursor= (empty for the first page)
+        if 'cursor' in request.args:
+            bookmarks, next_cursor = keyset_page(
+                bookmark_serializer.apply(query), Bookmark, request.args['cursor'], per_page
+            )
+            return jsonify({
+                'bookmarks': bookmark_serializer.dump_many(bookmarks),
+                'total': total,
+                'next_cursor': next_cursor
+            })
+        
+        # Query with pagination, the total comes from the count cache
+        bookmarks = bookmark_serializer.apply(query)\
             .order_by(Bookmark.created_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+            .paginate(page=page, per_page=per_page, error_out=False, count=False)
             
         return jsonify({
-            'bookmarks': [bookmark.to_dict() for bookmark in bookmarks.items],
-            'total': bookmarks.total,
-            'pages': bookmarks.pages,
+            'bookmarks': bookmark_serializer.dump_many(bookmarks.items),
+            'total': total,
+            'pages': page_count(total, bookmarks.per_page),
             'current_page': bookmarks.page
         })
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print("Error in get_bookmarks:", str(e))
         return jsonify({'error': str(e)}), 500
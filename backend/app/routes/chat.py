@@ -1,10 +1,66 @@
-from flask import Blueprint, request, jsonify
+import math
+import time
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.chat_service import ChatService
+from app.services.search_service import SearchService
+from app.services.chat_session_service import ChatSessionService
+from app.services.recommendation_service import RecommendationService
+from app.services.semantic_index import get_semantic_search
 from app.models import Resource, User, Bookmark
+from app.utils.bulkhead import BulkheadFull
+from app.utils.decorators import admin_required
+from app.utils.invalidation import on_commit_after_change
+from app.utils.sse import format_sse, streaming_headers
 
 chat_bp = Blueprint('chat', __name__)
 chat_service = ChatService()
+search_service = SearchService()
+chat_session_service = ChatSessionService()
+recommendation_service = RecommendationService(chat_service)
+semantic_search = get_semantic_search()
+
+def invalidate_cached_answers(resource_ids):
+    for resource_id in set(resource_ids):
+        chat_service.invalidate_resource(resource_id)
+
+def recompute_recommendations(user_ids):
+    # Runs after the commit, so the worker sees the new bookmarks
+    for user_id in set(user_ids):
+        recommendation_service.schedule(user_id)
+
+on_commit_after_change(Resource, invalidate_cached_answers, record=lambda target, operation: target.id)
+on_commit_after_change(Bookmark, recompute_recommendations, record=lambda target, operation: target.user_id)
+
+def assistant_busy(e):
+    """503 for a request shed by the LLM bulkhead, with a Retry-After hint."""
+    current_app.logger.warning(f"AI assistant busy: {str(e)}")
+    response = jsonify({'error': 'The AI assistant is busy, please try again shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(math.ceil(e.retry_after or 1))
+    return response
+
+def resolve_conversation(data):
+    """Return ``(session, history)`` for a chat request.
+
+    Requests that still post ``conversation_history`` are answered statelessly
+    (session is None). Otherwise the history comes from the server-side session
+    named by ``session_id``, and a new, not yet saved session is started when
+    there is none. It is stored with its first turns, only once a reply exists.
+    Raises LookupError for an unknown or expired session id.
+    """
+    if 'conversation_history' in data:
+        return None, data.get('conversation_history')
+    
+    user_id = int(get_jwt_identity())
+    session_id = data.get('session_id')
+    if not session_id:
+        return chat_session_service.new_session(user_id), []
+    
+    session = chat_session_service.get_session(session_id, user_id)
+    if session is None:
+        raise LookupError(session_id)
+    return session, chat_session_service.get_history(session)
 
 @chat_bp.route('', methods=['OPTIONS'])
 @chat_bp.route('/', methods=['OPTIONS'])
@@ -17,23 +73,140 @@ def handle_options():
 def general_chat():
     data = request.get_json()
     message = data.get('message')
-    conversation_history = data.get('conversation_history')
     
     if not message:
         return jsonify({'error': 'Message is required'}), 400
     
+    try:
+        session, conversation_history = resolve_conversation(data)
+    except LookupError:
+        return jsonify({'error': 'Chat session not found'}), 404
+    
     try:
         # Get AI response
         response = chat_service.general_chat(message, conversation_history)
         
         if 'error' in response:
             return jsonify(response), 500
+        
+        if session is not None:
+            chat_session_service.append(session, ('user', message), ('assistant', response['reply']))
+            response['session_id'] = session.id
             
         return jsonify(response)
         
+    except BulkheadFull as e:
+        return assistant_busy(e)
     except Exception as e:
         return jsonify({'error': 'Failed to process chat message'}), 500
 
+@chat_bp.route('/stream', methods=['POST'], strict_slashes=False)
+@jwt_required()
+def stream_chat():
+    data = request.get_json()
+    message = data.get('message')
+    
+    if not message:
+        return jsonify({'error': 'Message is required'}), 400
+    
+    try:
+        session, conversation_history = resolve_conversation(data)
+    except LookupError:
+        return jsonify({'error': 'Chat session not found'}), 404
+    
+    try:
+        # Take the LLM slot now, so a saturated assistant gets a 503 rather than an empty stream
+        stream = chat_service.stream_chat(message, conversation_history)
+    except BulkheadFull as e:
+        return assistant_busy(e)
+    except Exception as e:
+        current_app.logger.error(f"Chat stream error: {str(e)}")
+        return jsonify({'error': 'Failed to get response from Gemini'}), 500
+    
+    def generate():
+        started = time.monotonic()
+        first_token_at = None
+        tokens = 0
+        completed = False
+        reply = []
+        try:
+            for text, token_count in stream:
+                if first_token_at is None:
+                    first_token_at = time.monotonic()
+                    if session is not None:
+                        # Lets the client send only the next message. Sent with the
+                        # first token, the session is only saved once part of a reply exists.
+                        yield format_sse('session', {'session_id': session.id})
+                tokens += token_count
+                reply.append(text)
+                yield format_sse('token', {'text': text})
+            completed = True
+            yield format_sse('done', {
+                'ttft_ms': round((first_token_at - started) * 1000, 1) if first_token_at else None,
+                'total_ms': round((time.monotonic() - started) * 1000, 1),
+                'tokens': tokens
+            })
+        except Exception as e:
+            current_app.logger.error(f"Chat stream error: {str(e)}")
+            yield format_sse('error', {'error': 'Failed to get response from Gemini'})
+        finally:
+            # Keep what the user has seen, even if they stopped the reply early
+            if session is not None and reply:
+                try:
+                    chat_session_service.append(session, ('user', message), ('assistant', ''.join(reply)))
+                except Exception as e:
+                    current_app.logger.error(f"Failed to save chat turn: {str(e)}")
+            # Runs on completion, on error and when the client disconnects
+            # (the server closes the generator, which stops reading from Gemini)
+            current_app.logger.info(
+                f"Chat stream {'completed' if completed else 'cancelled'}: "
+                f"ttft_ms={round((first_token_at - started) * 1000, 1) if first_token_at else None} "
+                f"total_ms={round((time.monotonic() - started) * 1000, 1)} tokens={tokens}"
+            )
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    # Frees the slot even if the client leaves before the first chunk is sent
+    response.call_on_close(stream.close)
+    return streaming_headers(response)
+
+@chat_bp.route('/sessions', methods=['GET'], strict_slashes=False)
+@jwt_required()
+def list_sessions():
+    sessions = chat_session_service.list_sessions(int(get_jwt_identity()))
+    return jsonify({'sessions': [session.to_dict() for session in sessions]})
+
+@chat_bp.route('/sessions', methods=['POST'], strict_slashes=False)
+@jwt_required()
+def create_session():
+    data = request.get_json(silent=True) or {}
+    try:
+        session = chat_session_service.create_session(int(get_jwt_identity()), data.get('title'))
+        return jsonify(session.to_dict()), 201
+    except Exception as e:
+        current_app.logger.error(f"Failed to create chat session: {str(e)}")
+        return jsonify({'error': 'Failed to create chat session'}), 500
+
+@chat_bp.route('/sessions/<session_id>', methods=['GET'])
+@jwt_required()
+def get_session(session_id):
+    session = chat_session_service.get_session(session_id, int(get_jwt_identity()))
+    if session is None:
+        return jsonify({'error': 'Chat session not found'}), 404
+    
+    result = session.to_dict()
+    result['turns'] = [turn.to_dict() for turn in chat_session_service.get_turns(session)]
+    return jsonify(result)
+
+@chat_bp.route('/sessions/<session_id>', methods=['DELETE'])
+@jwt_required()
+def delete_session(session_id):
+    session = chat_session_service.get_session(session_id, int(get_jwt_identity()))
+    if session is None:
+        return jsonify({'error': 'Chat session not found'}), 404
+    
+    chat_session_service.delete_session(session)
+    return jsonify({'message': 'Chat session deleted'})
+
 @chat_bp.route('/query', methods=['POST'], strict_slashes=False)
 @jwt_required()
 def chat():
@@ -44,41 +217,57 @@ def chat():
         return jsonify({'error': 'Query is required'}), 400
     
     try:
-        # Get relevant resources from the database
-        relevant_resources = Resource.query.filter(
-            Resource.is_approved == True,
-            (Resource.title.ilike(f'%{query}%') |
-             Resource.description.ilike(f'%{query}%'))
-        ).limit(5).all()
+        # Get relevant resources by meaning, falling back to keyword search
+        # when nothing in the catalog is close enough
+        relevant_resources = [resource for resource, _ in semantic_search.search(query, limit=5)]
+        if not relevant_resources:
+            relevant_resources = search_service.search(
+                query, approved_only=True, per_page=5, with_total=False
+            ).items
         
-        # Get AI response
-        response = chat_service.get_response(query, relevant_resources)
+        # Get AI response, repeat questions over the same resources come from the cache
+        response = chat_service.get_cached_response(query, relevant_resources)
         
         return jsonify({
             'response': response,
             'relevant_resources': [resource.to_dict() for resource in relevant_resources]
         })
         
+    except BulkheadFull as e:
+        return assistant_busy(e)
     except Exception as e:
         return jsonify({'error': 'Failed to process chat query'}), 500
 
+@chat_bp.route('/stats', methods=['GET'], strict_slashes=False)
+@jwt_required()
+@admin_required
+def get_chat_stats():
+    return jsonify({
+        'llm_bulkhead': chat_service.bulkhead_stats(),
+        'answer_cache': chat_service.answer_cache_stats(),
+        'context_snippets': chat_service.context_stats(),
+        'recommendations': recommendation_service.stats()
+    })
+
 @chat_bp.route('/recommendations', methods=['GET'], strict_slashes=False)
 @jwt_required()
 def get_recommendations():
     try:
-        # Get user's bookmarked resources
-        user_id = get_jwt_identity()
+        user_id = int(get_jwt_identity())
         user = User.query.get(user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
-            
-        bookmarked_resources = Bookmark.query.filter_by(user_id=user_id).all()
         
-        # Get personalized recommendations
-        recommendations = chat_service.get_recommendations(bookmarked_resources)
+        # Served from the stored copy, Gemini only runs in the background
+        # after the user's bookmarks change
+        recommendation, status = recommendation_service.get(user_id)
+        if recommendation is None:
+            return jsonify({'recommendations': None, 'status': status}), 202
         
         return jsonify({
-            'recommendations': recommendations
+            'recommendations': {'response': recommendation.content},
+            'status': status,
+            'computed_at': recommendation.computed_at.isoformat()
         })
         
     except Exception as e:
@@ -1,16 +1,48 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Resource, db, User
+from app.services.listing_cache import catalog_version, resource_counts
 from app.utils.decorators import admin_required
+from app.utils.http_cache import conditional_get
+from app.utils.pagination import InvalidCursor, keyset_page, page_count
+from app.utils.serializers import json_response, resource_rows, resource_serializer
 
 resources_bp = Blueprint('resources', __name__)
 
+def paginated_resources(query, count_key):
+    """List body for a resource query: keyset page with ``?cursor=``, numbered page otherwise.
+
+    Pages are read as column tuples (resource_rows), not Resource objects.
+    """
+    per_page = request.args.get('per_page', 20, type=int)
+    total = resource_counts.count('resources', count_key, query)
+    
+    if 'cursor' in request.args:
+        resources, next_cursor = keyset_page(
+            resource_rows.project(query), Resource, request.args['cursor'], per_page
+        )
+        return {
+            'resources': resource_rows.dump_many(resources),
+            'total': total,
+            'next_cursor': next_cursor
+        }
+    
+    # The total comes from the count cache, not a COUNT(*) per page
+    resources = resource_rows.project(query).order_by(Resource.created_at.desc()).paginate(
+        page=request.args.get('page', 1, type=int), per_page=per_page, error_out=False, count=False
+    )
+    return {
+        'resources': resource_rows.dump_many(resources.items),
+        'total': total,
+        'pages': page_count(total, resources.per_page),
+        'current_page': resources.page
+    }
+
 @resources_bp.route('/', methods=['GET'], strict_slashes=False)
+@conditional_get(catalog_version)
 def get_resources():
     try:
         # Handle paginated list of all resources
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         category = request.args.get('category')
         
         query = Resource.query.filter_by(is_approved=True)
@@ -19,16 +51,9 @@ def get_resources():
         if category:
             query = query.filter_by(category=category)
         
-        resources = query.order_by(Resource.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
-        
-        return jsonify({
-            'resources': [resource.to_dict() for resource in resources.items],
-            'total': resources.total,
-            'pages': resources.pages,
-            'current_page': resources.page
-        })
+        return json_response(paginated_resources(query, (True, category)))
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f"Error fetching resources:", str(e))  # Debug log
         return jsonify({'error': 'Failed to fetch resources'}), 500
@@ -61,8 +86,9 @@ def create_resource():
         return jsonify({'error': 'Failed to create resource'}), 500
 
 @resources_bp.route('/<int:id>', methods=['GET'], strict_slashes=False)
+@conditional_get(catalog_version)
 def get_resource(id):
-    resource = Resource.query.get_or_404(id)
+    resource = resource_serializer.apply(Resource.query).get_or_404(id)
     return jsonify(resource.to_dict())
 
 @resources_bp.route('/<int:id>', methods=['PUT'], strict_slashes=False)
@@ -100,16 +126,7 @@ def delete_resource(id):
 @jwt_required()
 @admin_required
 def get_pending_resources():
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
-    
-    resources = Resource.query.filter_by(is_approved=False).order_by(
-        Resource.created_at.desc()
-    ).paginate(page=page, per_page=per_page, error_out=False)
-    
-    return jsonify({
-        'resources': [resource.to_dict() for resource in resources.items],
-        'total': resources.total,
-        'pages': resources.pages,
-        'current_page': resources.page
-    }) 
\ No newline at end of file
+    try:
+        return json_response(paginated_resources(Resource.query.filter_by(is_approved=False), (False, None)))
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400 
\ No newline at end of file
@@ -1,7 +1,20 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+import json
+import time
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required
 from app.services.github_service import GitHubService
 from app.services.arxiv_service import ArxivService
+from app.services.search_service import SearchService
+from app.services.trending_service import TrendingService
+from app.services.ingestion_service import IngestionService
+from app.services.semantic_index import get_semantic_search
+from app.utils.fanout import fan_out, iter_fan_out
+from app.utils.decorators import admin_required
+from app.utils.http import get_http_client
+from app.utils.invalidation import on_commit_after_change
+from app.utils.rate_limit import RateLimitExceeded
+from app.utils.serializers import json_response, resource_rows
+from app.utils.sse import format_sse, streaming_headers
 from app.models import Resource
 from app.extensions import db
 from flask import current_app
@@ -9,6 +22,65 @@ from flask import current_app
 search_bp = Blueprint('search', __name__)
 github_service = GitHubService()
 arxiv_service = ArxivService()
+search_service = SearchService()
+trending_service = TrendingService(github_service, arxiv_service)
+ingestion_service = IngestionService(github_service, arxiv_service)
+semantic_search = get_semantic_search()
+
+@search_bp.record_once
+def init_trending(state):
+    trending_service.init_app(state.app)
+
+def semantic_change(target, operation):
+    return target.id, None if operation == 'delete' else (target.title, target.description, target.is_approved)
+
+def update_semantic_index(changes):
+    # Only committed rows go into the index, the last change to a row wins
+    semantic_search.apply_changes(dict(changes))
+
+on_commit_after_change(Resource, update_semantic_index, record=semantic_change)
+
+def search_github_or_degrade(query, page, per_page):
+    """Search GitHub, falling back to the last cached result when out of quota."""
+    try:
+        return github_service.search_repositories(query, page, per_page)
+    except RateLimitExceeded as e:
+        current_app.logger.warning(f"GitHub search degraded: {str(e)}")
+        results = github_service.cached_search(query, page, per_page) or {
+            'items': [],
+            'total': 0,
+            'pages': 0,
+            'current_page': page
+        }
+        return dict(results, degraded=True, rate_limit=github_service.rate_limit_budget())
+
+def search_mirror_or_live(source, live_search, query, page, per_page):
+    """Answer from the local external_item mirror when it has enough fresh hits.
+
+    The choice is made once per query (see SearchService.mirror_cutoff), so
+    paging never switches between mirror and live totals. Otherwise run
+    ``live_search`` and write its items through to the mirror, which also
+    refreshes them for later searches.
+    """
+    fresh_since = search_service.mirror_cutoff(source, query)
+    if fresh_since is not None:
+        mirrored = search_service.search_external(source, query, page, per_page, fresh_since=fresh_since)
+        return {
+            'items': [item.to_dict() for item in mirrored.items],
+            'total': mirrored.total,
+            'pages': mirrored.pages,
+            'current_page': mirrored.page,
+            'from_mirror': True
+        }
+    
+    results = live_search(query, page, per_page)
+    if not results.get('degraded'):
+        try:
+            ingestion_service.upsert_items(source, results['items'])
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.warning(f"Could not mirror {source} results: {str(e)}")
+    return results
 
 @search_bp.route('/', methods=['GET'], strict_slashes=False)
 def search_local():
@@ -16,15 +88,42 @@ def search_local():
     if not query:
         return jsonify({'resources': []})
     
-    # Search in title and description
-    resources = Resource.query.filter(
-        (Resource.title.ilike(f'%{query}%')) |
-        (Resource.description.ilike(f'%{query}%'))
-    ).all()
+    # Optional pagination, all hits are returned when per_page is not given
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', type=int)
     
-    return jsonify({
-        'resources': [resource.to_dict() for resource in resources]
-    })
+    # Full-text search over title, description and category
+    results = search_service.search(query, page=page, per_page=per_page, as_rows=True)
+    
+    response = {
+        'resources': resource_rows.dump_many(results.items)
+    }
+    if per_page:
+        response.update({
+            'total': results.total,
+            'pages': results.pages,
+            'current_page': results.page
+        })
+    return json_response(response)
+
+@search_bp.route('/semantic', methods=['GET'], strict_slashes=False)
+def search_semantic():
+    query = request.args.get('q', '')
+    if not query:
+        return jsonify({'resources': []})
+    
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    
+    try:
+        started = time.monotonic()
+        hits = semantic_search.search(query, limit=limit)
+        return jsonify({
+            'resources': [dict(resource.to_dict(), score=round(score, 4)) for resource, score in hits],
+            'took_ms': round((time.monotonic() - started) * 1000, 1)
+        })
+    except Exception as e:
+        current_app.logger.error(f"Semantic search error: {str(e)}")
+        return jsonify({'error': 'Semantic search failed'}), 500
 
 @search_bp.route('/github', methods=['GET'], strict_slashes=False)
 def search_github():
@@ -32,8 +131,11 @@ def search_github():
     if not query:
         return jsonify({'items': []})
     
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    
     try:
-        results = github_service.search_repositories(query)
+        results = search_github_or_degrade(query, page, per_page)
         return jsonify(results)
     except Exception as e:
         current_app.logger.error(f"GitHub search error: {str(e)}")
@@ -48,8 +150,11 @@ def search_arxiv():
     if not query:
         return jsonify({'items': []})
     
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    
     try:
-        results = arxiv_service.search_papers(query)
+        results = arxiv_service.search_papers(query, page, per_page)
         return jsonify(results)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -57,9 +162,11 @@ def search_arxiv():
 @search_bp.route('/github/trending', methods=['GET'], strict_slashes=False)
 def get_trending_github():
     try:
-        trending_github = github_service.get_trending_repositories()
+        # Served from the precomputed snapshot, see TrendingService
+        trending_github, refreshed_at = trending_service.get('github')
         return jsonify({
-            'items': trending_github
+            'items': trending_github,
+            'refreshed_at': refreshed_at
         })
     except Exception as e:
         current_app.logger.error(f"GitHub trending error: {str(e)}")
@@ -68,6 +175,64 @@ def get_trending_github():
             'items': []
         }), 500
 
+@search_bp.route('/arxiv/trending', methods=['GET'], strict_slashes=False)
+def get_trending_arxiv():
+    try:
+        trending_arxiv, refreshed_at = trending_service.get('arxiv')
+        return jsonify({
+            'items': trending_arxiv,
+            'refreshed_at': refreshed_at
+        })
+    except Exception as e:
+        current_app.logger.error(f"arXiv trending error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'items': []
+        }), 500
+
+@search_bp.route('/stats', methods=['GET'], strict_slashes=False)
+@jwt_required()
+@admin_required
+def get_search_stats():
+    return jsonify({
+        'cache': {
+            'github': github_service.cache.stats() if github_service.cache else None,
+            'arxiv': arxiv_service.cache.stats() if arxiv_service.cache else None
+        },
+        'singleflight': {
+            'github': github_service.flights.stats(),
+            'arxiv': arxiv_service.flights.stats()
+        },
+        'http': get_http_client().stats(),
+        'github_rate_limit': github_service.rate_limit_budget(),
+        'semantic_index': semantic_search.stats()
+    })
+
+def search_all_tasks(query, page, per_page):
+    """Tasks and upstream timeouts shared by /all and /all/stream."""
+    def search_local_db():
+        local_results = search_service.search(
+            query, approved_only=True, page=page, per_page=per_page, as_rows=True
+        )
+        return {
+            'items': resource_rows.dump_many(local_results.items),
+            'total': local_results.total,
+            'pages': local_results.pages,
+            'current_page': local_results.page
+        }
+    
+    tasks = {
+        'local': search_local_db,
+        'github': lambda: search_mirror_or_live('github', search_github_or_degrade, query, page, per_page),
+        'arxiv': lambda: search_mirror_or_live('arxiv', arxiv_service.search_papers, query, page, per_page)
+    }
+    # The local search is a quick DB query, it runs on the request thread
+    timeouts = {
+        'github': current_app.config['SEARCH_GITHUB_TIMEOUT'],
+        'arxiv': current_app.config['SEARCH_ARXIV_TIMEOUT']
+    }
+    return tasks, timeouts
+
 @search_bp.route('/all', methods=['GET'], strict_slashes=False)
 @jwt_required()
 def search_all():
@@ -75,28 +240,51 @@ def search_all():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
     
-    # Search local database
-    local_results = Resource.query.filter(
-        Resource.is_approved == True,
-        (Resource.title.ilike(f'%{query}%') |
-         Resource.description.ilike(f'%{query}%'))
-    ).order_by(Resource.created_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    # Query all sources concurrently, each upstream bounded by its own timeout
+    tasks, timeouts = search_all_tasks(query, page, per_page)
+    results, sources = fan_out(tasks, timeouts, inline=('local',))
     
-    # Search GitHub
-    github_results = github_service.search_repositories(query, page, per_page)
-    
-    # Search arXiv
-    arxiv_results = arxiv_service.search_papers(query, page, per_page)
+    # Sources that failed or timed out come back as empty sections
+    empty = {'items': [], 'total': 0, 'pages': 0, 'current_page': page}
     
     return jsonify({
-        'local': {
-            'items': [resource.to_dict() for resource in local_results.items],
-            'total': local_results.total,
-            'pages': local_results.pages,
-            'current_page': local_results.page
-        },
-        'github': github_results,
-        'arxiv': arxiv_results
-    }) 
\ No newline at end of file
+        'local': results.get('local', empty),
+        'github': results.get('github', empty),
+        'arxiv': results.get('arxiv', empty),
+        'sources': sources
+    })
+
+@search_bp.route('/all/stream', methods=['GET'], strict_slashes=False)
+@jwt_required()
+def search_all_stream():
+    """Like /all, but sends each source as soon as it completes.
+    
+    Server-Sent Events by default, one JSON object per line with
+    ``?format=ndjson``. Every message is
+    ``{"source": ..., "status": ..., "latency_ms": ..., "data": {...}}``
+    and the stream ends with a ``{"source": "done", "sources": {...}}`` message.
+    """
+    query = request.args.get('q', '')
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
+    ndjson = request.args.get('format') == 'ndjson'
+    
+    tasks, timeouts = search_all_tasks(query, page, per_page)
+    empty = {'items': [], 'total': 0, 'pages': 0, 'current_page': page}
+    
+    def encode(event, payload):
+        if ndjson:
+            return json.dumps(payload) + '\n'
+        return format_sse(event, payload)
+    
+    def generate():
+        sources = {}
+        for name, result, source in iter_fan_out(tasks, timeouts, inline=('local',)):
+            sources[name] = source
+            yield encode(name, dict(source, source=name, data=result if result is not None else empty))
+        yield encode('done', {'source': 'done', 'sources': sources})
+    
+    return streaming_headers(Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson' if ndjson else 'text/event-stream'
+    ))
@@ -1,7 +1,20 @@
-import requests
 from flask import current_app
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import math
 import xml.etree.ElementTree as ET
+from app.utils.cache import TTLCache, normalize_query, app_context_loader
+from app.utils.fanout import current_deadline
+from app.utils.http import get_http_client
+from app.utils.singleflight import SingleFlight
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+OPENSEARCH = '{http://a9.com/-/spec/opensearch/1.1/}'
+
+# arXiv refuses pages larger than this in a single request
+MAX_RESULTS_PER_REQUEST = 2000
+
+# The AI/ML categories every search is restricted to
+AI_CATEGORIES_QUERY = "cat:cs.AI OR cat:cs.LG OR cat:cs.CL OR cat:stat.ML"
 
 def truncate_text(text, max_words=50):
     """Truncate text to specified number of words and add ellipsis if needed."""
@@ -12,100 +25,144 @@ def truncate_text(text, max_words=50):
         return text
     return " ".join(words[:max_words]) + "..."
 
+def paper_to_dict(paper):
+    """Map a parsed feed entry to the shape served by the search routes."""
+    return {
+        'id': paper['id'],
+        'title': paper['title'],
+        'description': truncate_text(paper['summary']),  # Truncate description
+        'url': paper['url'],
+        'authors': paper['authors'],
+        'published': paper['published'],
+        'type': 'research_paper'  # Add type field
+    }
+
+def _parse_entry(entry):
+    """Read an <entry> element in a single pass over its children."""
+    paper = {'id': None, 'title': None, 'summary': None, 'url': None, 'published': None, 'authors': []}
+    for child in entry:
+        tag = child.tag
+        if tag == ATOM + 'id':
+            paper['id'] = child.text
+        elif tag == ATOM + 'title':
+            paper['title'] = child.text
+        elif tag == ATOM + 'summary':
+            paper['summary'] = child.text
+        elif tag == ATOM + 'published':
+            paper['published'] = child.text
+        elif tag == ATOM + 'link':
+            # The first link is the abstract page
+            if paper['url'] is None:
+                paper['url'] = child.get('href')
+        elif tag == ATOM + 'author':
+            for name in child:
+                if name.tag == ATOM + 'name':
+                    paper['authors'].append(name.text)
+    return paper
+
+def iter_atom_entries(chunks, feed_info=None):
+    """Incrementally parse an arXiv Atom feed from an iterable of byte chunks.
+
+    Yields one dict per <entry> as soon as its closing tag has been read and
+    frees the element right after, so neither the raw response nor the full
+    tree is ever held in memory. If ``feed_info`` is a dict, the feed's
+    ``opensearch:totalResults`` is stored in it under 'total'.
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag == ATOM + 'entry':
+                yield _parse_entry(elem)
+                elem.clear()
+            elif elem.tag == OPENSEARCH + 'totalResults' and feed_info is not None:
+                feed_info['total'] = int(elem.text)
+    parser.close()
+
 class ArxivService:
     def __init__(self):
         self.base_url = 'http://export.arxiv.org/api/query'
+        self.cache = None
+        self.flights = SingleFlight()
+    
+    def _init_cache(self):
+        if self.cache is None:
+            self.cache = TTLCache(
+                maxsize=current_app.config.get('SEARCH_CACHE_MAX_ENTRIES', 512),
+                ttl=current_app.config.get('ARXIV_CACHE_TTL', 900),
+                stale_ttl=current_app.config.get('SEARCH_CACHE_STALE_TTL', 600)
+            )
     
-    def search_papers(self, query):
+    def _fetch_entries(self, search_query, start, max_results, feed_info=None):
+        """Stream one page of results and yield the parsed entries."""
+        response = get_http_client().get(self.base_url, params={
+            'search_query': search_query,
+            'start': start,
+            'max_results': max_results,
+            'sortBy': 'submittedDate',
+            'sortOrder': 'descending'
+        }, stream=True, deadline=current_deadline())
         try:
-            # Add AI-related keywords to the query
-            enhanced_query = f"{query} AND (cat:cs.AI OR cat:cs.LG OR cat:cs.CL OR cat:stat.ML)"
-            
-            params = {
-                'search_query': enhanced_query,
-                'start': 0,
-                'max_results': 10,  # Limit to 10 results
-                'sortBy': 'submittedDate',
-                'sortOrder': 'descending'
-            }
-            
-            response = requests.get(self.base_url, params=params)
             response.raise_for_status()
+            yield from iter_atom_entries(response.iter_content(chunk_size=16 * 1024), feed_info)
+        finally:
+            response.close()
+    
+    def search_papers(self, query, page=1, per_page=10):
+        self._init_cache()
+        key = (normalize_query(query), page, per_page)
+        loader = app_context_loader(self._search_papers, query, page, per_page)
+        # Concurrent misses for the same key share a single upstream call
+        return self.cache.get_or_load(key, loader, flights=self.flights)
+    
+    def _search_papers(self, query, page=1, per_page=10):
+        try:
+            page = max(page or 1, 1)
+            per_page = min(max(per_page or 10, 1), MAX_RESULTS_PER_REQUEST)
             
-            # Parse XML response
-            root = ET.fromstring(response.content)
-            namespace = {'atom': 'http://www.w3.org/2005/Atom'}
+            # Add AI-related keywords to the query
+            enhanced_query = f"{query} AND ({AI_CATEGORIES_QUERY})"
             
+            feed_info = {}
             items = []
-            for entry in root.findall('.//atom:entry', namespace):
-                title = entry.find('atom:title', namespace).text
-                summary = entry.find('atom:summary', namespace).text
-                link = entry.find('atom:link', namespace).get('href')
-                published = entry.find('atom:published', namespace).text
-                
-                # Extract authors
-                authors = []
-                for author in entry.findall('.//atom:name', namespace):
-                    authors.append(author.text)
-                
-                items.append({
-                    'id': entry.find('atom:id', namespace).text,
-                    'title': title,
-                    'description': truncate_text(summary),  # Truncate description
-                    'url': link,
-                    'authors': authors,
-                    'published': published,
-                    'type': 'research_paper'  # Add type field
-                })
+            for paper in self._fetch_entries(enhanced_query, (page - 1) * per_page, per_page, feed_info):
+                items.append(paper_to_dict(paper))
             
+            total = feed_info.get('total', len(items))
             return {
                 'items': items,
-                'total': len(items),
-                'pages': 1,
-                'current_page': 1
+                'total': total,
+                'pages': math.ceil(total / per_page),
+                'current_page': page
             }
-            
+        
         except Exception as e:
             raise Exception(f"Failed to fetch arXiv papers: {str(e)}")
     
+    def fetch_ai_papers(self, start=0, max_results=100):
+        """Newest papers across the AI categories as raw parsed entries, for bulk ingestion."""
+        return list(self._fetch_entries(AI_CATEGORIES_QUERY, start, min(max_results, MAX_RESULTS_PER_REQUEST)))
+    
     def get_trending_papers(self):
         try:
             # Get papers from the last 7 days
-            date_threshold = datetime.now() - timedelta(days=7)
-            query = f"cat:cs.AI OR cat:cs.LG OR cat:cs.CL OR cat:stat.ML"
-            
-            search = requests.get(self.base_url, params={
-                'search_query': query,
-                'start': 0,
-                'max_results': 10,
-                'sortBy': 'submittedDate',
-                'sortOrder': 'descending'
-            })
-            
-            search.raise_for_status()
+            date_threshold = datetime.now(timezone.utc) - timedelta(days=7)
+            query = AI_CATEGORIES_QUERY
             
-            # Parse the XML response
-            root = ET.fromstring(search.content)
-            
-            # Extract entries
             results = []
-            for entry in root.findall('{http://www.w3.org/2005/Atom}entry'):
-                title = entry.find('{http://www.w3.org/2005/Atom}title').text
-                summary = entry.find('{http://www.w3.org/2005/Atom}summary').text
-                link = entry.find('{http://www.w3.org/2005/Atom}link').get('href')
-                published = entry.find('{http://www.w3.org/2005/Atom}published').text
-                
-                if datetime.fromisoformat(published) > date_threshold:
+            for paper in self._fetch_entries(query, 0, 10):
+                # arXiv timestamps are UTC with a 'Z' suffix
+                if datetime.fromisoformat(paper['published'].replace('Z', '+00:00')) > date_threshold:
                     results.append({
-                        'title': title,
-                        'description': truncate_text(summary),  # Truncate description
-                        'url': link,
-                        'published': published,
+                        'title': paper['title'],
+                        'description': truncate_text(paper['summary']),  # Truncate description
+                        'url': paper['url'],
+                        'published': paper['published'],
                         'type': 'research_paper'  # Add type field
                     })
             
             return results
-            
+        
         except Exception as e:
             current_app.logger.error(f"arXiv API error: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
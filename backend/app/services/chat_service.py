@@ -1,63 +1,164 @@
-import google.generativeai as genai
 from flask import current_app
-import json
+import hashlib
+import threading
+import time
+from app.services.context_builder import ContextBuilder
+from app.services.llm_provider import create_provider
+from app.utils.bulkhead import Bulkhead, BulkheadFull
+from app.utils.cache import TTLCache, normalize_query
+from app.utils.tokens import estimate_tokens
+
+GENERAL_CHAT_PROMPT = """You are an AI learning assistant specializing in artificial intelligence and machine learning.
+Your role is to help users understand AI concepts, provide explanations, and guide them in their learning journey.
+Be friendly, professional, and provide clear, concise answers."""
+
+def resource_fingerprint(resources):
+    """Hash of the (id, updated_at) pairs of a retrieved resource set."""
+    digest = hashlib.sha1()
+    for resource in sorted(resources, key=lambda resource: resource.id):
+        digest.update(f"{resource.id}:{resource.updated_at.isoformat() if resource.updated_at else ''};".encode())
+    return digest.hexdigest()
 
 class ChatService:
     def __init__(self):
-        self.model = None
+        self.provider = None
+        self.bulkhead = None
+        self.answer_cache = None
+        self.context_builder = None
+        self._answer_keys_by_resource = {}
+        self._answer_index_lock = threading.Lock()
     
-    def _init_gemini(self):
-        if self.model is None:
-            api_key = current_app.config.get('GOOGLE_API_KEY')
-            if not api_key:
-                current_app.logger.error("Google API key not found in configuration")
-                return
+    def _init_provider(self):
+        if self.provider is None:
             try:
-                genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel('gemini-2.0-flash')
-                current_app.logger.info("Gemini model initialized successfully")
+                self.provider = create_provider()
+                if self.provider:
+                    current_app.logger.info(f"LLM provider '{self.provider.name}' initialized successfully")
             except Exception as e:
-                current_app.logger.error(f"Failed to initialize Gemini model: {str(e)}")
+                current_app.logger.error(f"Failed to initialize LLM provider: {str(e)}")
                 raise
+        self._init_bulkhead()
+    
+    def _init_bulkhead(self):
+        if self.bulkhead is None:
+            self.bulkhead = Bulkhead(
+                max_concurrent=current_app.config.get('LLM_MAX_CONCURRENT', 4),
+                max_queue=current_app.config.get('LLM_MAX_QUEUE', 16),
+                max_wait=current_app.config.get('LLM_QUEUE_TIMEOUT', 10)
+            )
+    
+    def bulkhead_stats(self):
+        return self.bulkhead.stats() if self.bulkhead else None
     
     def get_response(self, query, relevant_resources):
-        self._init_gemini()
-        if not self.model:
+        self._init_provider()
+        if not self.provider:
             return {"error": "Google API key not configured"}, 500
             
         try:
-            # Prepare context from relevant resources
-            context = self._prepare_context(relevant_resources)
+            return {"response": self._generate_response(query, relevant_resources)}
             
-            # Create prompt
-            prompt = f"""You are an AI learning assistant specializing in artificial intelligence and machine learning.
-            Your role is to help users find and understand AI learning resources.
-            Provide clear, concise answers and recommend relevant resources when appropriate.
-
-            Context about available resources:
-            {context}
-            
-            User query: {query}
-            
-            Please provide a helpful response and recommend relevant resources if available."""
-            
-            # Get response from Gemini
-            response = self.model.generate_content(prompt)
-            
-            return {"response": response.text}
+        except BulkheadFull:
+            raise
+        except Exception as e:
+            current_app.logger.error(f"Gemini API error: {str(e)}")
+            return {"error": "Failed to get response from Gemini"}, 500
+    
+    def get_cached_response(self, query, relevant_resources):
+        """Like get_response, but repeat questions over the same resources skip Gemini.
+        
+        Answers are keyed by the normalized query and a fingerprint of the
+        retrieved resources (ids and updated_at), and dropped as soon as one
+        of those resources is edited or deleted.
+        """
+        self._init_provider()
+        if not self.provider:
+            return {"error": "Google API key not configured"}, 500
+        self._init_answer_cache()
+        
+        key = (normalize_query(query), resource_fingerprint(relevant_resources))
+        resource_ids = [resource.id for resource in relevant_resources]
+        
+        def load():
+            text = self._generate_response(query, relevant_resources)
+            self._index_answer(key, resource_ids)
+            return text
+        
+        try:
+            return {"response": self.answer_cache.get_or_load(key, load)}
             
+        except BulkheadFull:
+            raise
         except Exception as e:
             current_app.logger.error(f"Gemini API error: {str(e)}")
             return {"error": "Failed to get response from Gemini"}, 500
     
+    def _generate_response(self, query, relevant_resources):
+        # Prepare context from relevant resources
+        context = self._prepare_context(
+            relevant_resources, current_app.config.get('CHAT_CONTEXT_TOKEN_BUDGET', 1500), query
+        )
+        
+        # Create prompt
+        prompt = f"""You are an AI learning assistant specializing in artificial intelligence and machine learning.
+        Your role is to help users find and understand AI learning resources.
+        Provide clear, concise answers and recommend relevant resources when appropriate.
+
+        Context about available resources:
+        {context}
+        
+        User query: {query}
+        
+        Please provide a helpful response and recommend relevant resources if available."""
+        
+        # Get response from Gemini
+        with self.bulkhead.slot():
+            return self.provider.generate(prompt)
+    
+    def _init_answer_cache(self):
+        if self.answer_cache is None:
+            self.answer_cache = TTLCache(
+                maxsize=current_app.config.get('CHAT_ANSWER_CACHE_MAX_ENTRIES', 1000),
+                ttl=current_app.config.get('CHAT_ANSWER_CACHE_TTL', 3600)
+            )
+    
+    def _index_answer(self, key, resource_ids):
+        with self._answer_index_lock:
+            for resource_id in resource_ids:
+                self._answer_keys_by_resource.setdefault(resource_id, set()).add(key)
+            
+            # Forget keys the cache has already evicted so the index stays bounded
+            indexed = sum(len(keys) for keys in self._answer_keys_by_resource.values())
+            if indexed > 4 * self.answer_cache.maxsize:
+                for resource_id in list(self._answer_keys_by_resource):
+                    keys = {k for k in self._answer_keys_by_resource[resource_id] if self.answer_cache.peek(k) is not None}
+                    if keys:
+                        self._answer_keys_by_resource[resource_id] = keys
+                    else:
+                        del self._answer_keys_by_resource[resource_id]
+    
+    def invalidate_resource(self, resource_id):
+        """Drop cached answers that were generated with this resource in their context."""
+        if self.answer_cache is None:
+            return
+        with self._answer_index_lock:
+            keys = self._answer_keys_by_resource.pop(resource_id, ())
+        for key in keys:
+            self.answer_cache.delete(key)
+    
+    def answer_cache_stats(self):
+        return self.answer_cache.stats() if self.answer_cache else None
+    
     def get_recommendations(self, bookmarked_resources):
-        self._init_gemini()
-        if not self.model:
+        self._init_provider()
+        if not self.provider:
             return {"error": "Google API key not configured"}, 500
             
         try:
             # Prepare context from bookmarked resources
-            context = self._prepare_context(bookmarked_resources)
+            context = self._prepare_context(
+                bookmarked_resources, current_app.config.get('RECOMMENDATION_CONTEXT_TOKEN_BUDGET', 3000)
+            )
             
             # Create prompt
             prompt = f"""You are an AI learning assistant specializing in artificial intelligence and machine learning.
@@ -70,61 +171,134 @@ class ChatService:
             For each recommendation, provide a brief explanation of why it would be beneficial."""
             
             # Get recommendations from Gemini
-            response = self.model.generate_content(prompt)
+            with self.bulkhead.slot():
+                text = self.provider.generate(prompt)
             
-            return {"response": response.text}
+            return {"response": text}
             
+        except BulkheadFull:
+            raise
         except Exception as e:
             current_app.logger.error(f"Gemini API error: {str(e)}")
             return {"error": "Failed to get recommendations from Gemini"}, 500
     
-    def _prepare_context(self, resources):
-        if not resources:
-            return "No resources available."
-        
-        context = "Available resources:\n"
-        for resource in resources:
-            context += f"- {resource.title}\n"
-            context += f"  Description: {resource.description}\n"
-            context += f"  Category: {resource.category}\n"
-            context += f"  URL: {resource.url}\n\n"
-        
-        return context
+    def _prepare_context(self, resources, budget, query=None):
+        if self.context_builder is None:
+            self.context_builder = ContextBuilder(
+                maxsize=current_app.config.get('CONTEXT_SNIPPET_CACHE_SIZE', 5000),
+                max_words=current_app.config.get('CONTEXT_SNIPPET_MAX_WORDS', 80)
+            )
+        return self.context_builder.build(resources, budget, query)
+    
+    def context_stats(self):
+        return self.context_builder.stats() if self.context_builder else None
+
+    def _trim_history(self, conversation_history):
+        """Keep the newest turns that fit the history token budget.
+
+        Older turns that don't fit are folded into a short note listing what
+        the user asked about, so the model keeps some of the thread without
+        paying for the full text.
+        """
+        budget = current_app.config.get('CHAT_HISTORY_TOKEN_BUDGET', 4000)
+        summary_budget = current_app.config.get('CHAT_HISTORY_SUMMARY_TOKENS', 200)
+        
+        kept = []
+        used = 0
+        turns = [msg for msg in (conversation_history or []) if msg.get('role') in ('user', 'assistant') and msg.get('content')]
+        for index in range(len(turns) - 1, -1, -1):
+            cost = estimate_tokens(turns[index]['content'])
+            if used + cost > budget:
+                break
+            kept.append(turns[index])
+            used += cost
+        kept.reverse()
+        
+        dropped = turns[:len(turns) - len(kept)]
+        summary = None
+        if dropped:
+            topics = []
+            summary_used = 0
+            for msg in dropped:
+                if msg['role'] != 'user':
+                    continue
+                topic = ' '.join(msg['content'].split())[:120]
+                cost = estimate_tokens(topic)
+                if summary_used + cost > summary_budget:
+                    break
+                topics.append(f"- {topic}")
+                summary_used += cost
+            if topics:
+                summary = "Earlier in this conversation the user asked about:\n" + "\n".join(topics)
+        
+        return kept, summary
+        
+    def _build_contents(self, message, conversation_history=None):
+        """Assemble the system prompt, trimmed history and new message for one generate call."""
+        kept, summary = self._trim_history(conversation_history)
+        
+        system_prompt = GENERAL_CHAT_PROMPT
+        if summary:
+            system_prompt += "\n\n" + summary
+        
+        turns = [('user', system_prompt), ('model', 'Understood.')]
+        turns += [('user' if msg['role'] == 'user' else 'model', msg['content']) for msg in kept]
+        turns.append(('user', message))
+        
+        # Gemini expects alternating roles, merge consecutive turns from the same side
+        contents = []
+        for role, text in turns:
+            if contents and contents[-1]['role'] == role:
+                contents[-1]['parts'][0] += "\n\n" + text
+            else:
+                contents.append({'role': role, 'parts': [text]})
+        return contents
 
     def general_chat(self, message, conversation_history=None):
-        self._init_gemini()
-        if not self.model:
+        self._init_provider()
+        if not self.provider:
             return {"error": "Google API key not configured"}, 500
             
         try:
-            # Create chat
-            chat = self.model.start_chat(history=[])
-            
-            # Add system message
-            chat.send_message("""You are an AI learning assistant specializing in artificial intelligence and machine learning.
-            Your role is to help users understand AI concepts, provide explanations, and guide them in their learning journey.
-            Be friendly, professional, and provide clear, concise answers.""")
-
-            # Add conversation history if available
-            if conversation_history:
-                for msg in conversation_history:
-                    if msg['role'] == 'user':
-                        chat.send_message(msg['content'])
-                    elif msg['role'] == 'assistant':
-                        # For assistant messages, we'll just send the content without specifying a role
-                        chat.send_message(msg['content'])
-            
-            # Send current message and get response
-            response = chat.send_message(message)
+            # The whole conversation goes out in a single generation call
+            contents = self._build_contents(message, conversation_history)
+            started = time.monotonic()
+            with self.bulkhead.slot():
+                text = self.provider.generate(contents)
+            current_app.logger.info(
+                f"General chat: {len(contents)} turns, ~{sum(estimate_tokens(c['parts'][0]) for c in contents)} prompt tokens, "
+                f"{time.monotonic() - started:.2f}s"
+            )
             
-            if not response or not response.text:
+            if not text:
                 current_app.logger.error("Empty response from Gemini")
                 return {"error": "Empty response from AI"}, 500
                 
-            return {"reply": response.text}
+            return {"reply": text}
             
+        except BulkheadFull:
+            raise
         except Exception as e:
             current_app.logger.error(f"Gemini API error: {str(e)}")
             current_app.logger.error(f"Error type: {type(e).__name__}")
             current_app.logger.error(f"Error details: {str(e)}")
-            return {"error": f"Failed to get response from Gemini: {str(e)}"}, 500 
\ No newline at end of file
+            return {"error": f"Failed to get response from Gemini: {str(e)}"}, 500
+
+    def stream_chat(self, message, conversation_history=None):
+        """Return an iterator of ``(text, tokens)`` for each chunk of the reply as the model generates it.
+
+        The LLM slot is taken before returning, so BulkheadFull is raised
+        right away when the assistant is saturated. It is held until the
+        iterator is exhausted or closed; closing it early (e.g. the client
+        went away) also stops reading from the model stream.
+        """
+        self._init_provider()
+        if not self.provider:
+            raise RuntimeError("Google API key not configured")
+        
+        contents = self._build_contents(message, conversation_history)
+        self.bulkhead.acquire()
+        return self.bulkhead.hold(self._stream_chunks(contents))
+    
+    def _stream_chunks(self, contents):
+        yield from self.provider.stream(contents)
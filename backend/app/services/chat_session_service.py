@@ -0,0 +1,132 @@
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import inspect
+from app.extensions import db
+from app.models import ChatSession, ChatTurn
+
+
+class ChatSessionService:
+    """Stores chat conversations so each request only carries the new message."""
+
+    def new_session(self, user_id, title=None):
+        """An unsaved session, stored by its first ``append``.
+
+        A first message whose reply fails leaves nothing behind, and in
+        particular doesn't evict one of the user's real conversations.
+        """
+        return ChatSession(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            title=(title or '')[:200] or None,
+            turn_count=0
+        )
+
+    def create_session(self, user_id, title=None):
+        session = self.new_session(user_id, title)
+        self._store(session)
+        db.session.commit()
+        return session
+
+    def get_session(self, session_id, user_id):
+        """The user's session with this id, or None if it doesn't exist or has expired."""
+        session = ChatSession.query.filter_by(id=session_id, user_id=user_id).first()
+        if session is None or session.updated_at < self._expiry_cutoff():
+            return None
+        return session
+
+    def list_sessions(self, user_id):
+        return ChatSession.query.filter(
+            ChatSession.user_id == user_id,
+            ChatSession.updated_at >= self._expiry_cutoff()
+        ).order_by(ChatSession.updated_at.desc()).all()
+
+    def get_turns(self, session, limit=None):
+        """Turns of ``session`` oldest first, only the last ``limit`` if given."""
+        query = ChatTurn.query.filter_by(session_id=session.id).order_by(ChatTurn.id.desc())
+        if limit:
+            query = query.limit(limit)
+        turns = query.all()
+        turns.reverse()
+        return turns
+
+    def get_history(self, session):
+        """Recent turns in the ``conversation_history`` shape ChatService expects."""
+        limit = current_app.config.get('CHAT_SESSION_HISTORY_TURNS', 40)
+        return [{'role': turn.role, 'content': turn.content} for turn in self.get_turns(session, limit)]
+
+    def append(self, session, *turns):
+        """Add ``(role, content)`` turns to the end of ``session``, storing it first if it is new."""
+        if inspect(session).transient:
+            self._store(session)
+        now = datetime.utcnow()
+        for role, content in turns:
+            db.session.add(ChatTurn(session_id=session.id, role=role, content=content, created_at=now))
+        session.turn_count = (session.turn_count or 0) + len(turns)
+        session.updated_at = now
+        if not session.title:
+            first_user_turn = next((content for role, content in turns if role == 'user'), None)
+            if first_user_turn:
+                session.title = ' '.join(first_user_turn.split())[:200]
+        db.session.flush()
+
+        max_turns = current_app.config.get('CHAT_SESSION_MAX_TURNS', 200)
+        if session.turn_count > max_turns:
+            # Drop the oldest turns past the cap
+            cutoff = db.session.query(ChatTurn.id).filter_by(session_id=session.id).order_by(
+                ChatTurn.id.desc()
+            ).offset(max_turns - 1).limit(1).scalar()
+            ChatTurn.query.filter(
+                ChatTurn.session_id == session.id,
+                ChatTurn.id < cutoff
+            ).delete(synchronize_session=False)
+            session.turn_count = max_turns
+
+        db.session.commit()
+
+    def delete_session(self, session):
+        self._delete_sessions([session.id])
+        db.session.commit()
+
+    def purge_expired(self):
+        """Delete sessions that have been idle for longer than the TTL. Returns the count."""
+        count = self._purge_expired()
+        if count:
+            db.session.commit()
+        return count
+
+    def _purge_expired(self):
+        expired = [
+            session_id for (session_id,) in db.session.query(ChatSession.id).filter(
+                ChatSession.updated_at < self._expiry_cutoff()
+            )
+        ]
+        if expired:
+            self._delete_sessions(expired)
+        return len(expired)
+
+    def _store(self, session):
+        # Make room only once the session is really being kept, in the
+        # caller's transaction so the new session commits in one go
+        self._purge_expired()
+        self._evict_oldest(session.user_id)
+        db.session.add(session)
+        db.session.flush()
+
+    def _evict_oldest(self, user_id):
+        # Make room for one more session under the per-user cap
+        max_sessions = current_app.config.get('CHAT_SESSIONS_PER_USER', 20)
+        stale = [
+            session_id for (session_id,) in db.session.query(ChatSession.id).filter_by(
+                user_id=user_id
+            ).order_by(ChatSession.updated_at.desc()).offset(max(max_sessions - 1, 0))
+        ]
+        if stale:
+            self._delete_sessions(stale)
+
+    def _delete_sessions(self, session_ids):
+        ChatTurn.query.filter(ChatTurn.session_id.in_(session_ids)).delete(synchronize_session=False)
+        ChatSession.query.filter(ChatSession.id.in_(session_ids)).delete(synchronize_session=False)
+
+    def _expiry_cutoff(self):
+        return datetime.utcnow() - timedelta(days=current_app.config.get('CHAT_SESSION_TTL_DAYS', 30))
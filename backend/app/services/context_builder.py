@@ -0,0 +1,92 @@
+import re
+from app.utils.cache import TTLCache
+from app.utils.tokens import estimate_tokens
+
+
+def _terms(text):
+    return set(re.findall(r'\w+', (text or '').lower()))
+
+
+class ContextBuilder:
+    """Packs resource snippets into a prompt context of bounded size.
+
+    Each resource is rendered once per version: snippets are cached by
+    (id, updated_at), so an edited resource is re-rendered and the old
+    snippet simply ages out of the LRU.
+    """
+
+    def __init__(self, maxsize=5000, max_words=80):
+        self.max_words = max_words
+        # Snippets never go stale for a given key, the TTL only has to outlive the process
+        self.snippets = TTLCache(maxsize=maxsize, ttl=float('inf'))
+
+    def render(self, resource):
+        """Return ``(snippet, tokens)`` for a resource."""
+        return self.snippets.get_or_load((resource.id, resource.updated_at), lambda: self._render(resource))
+
+    def _render(self, resource):
+        description = resource.description or ''
+        words = description.split()
+        if len(words) > self.max_words:
+            description = ' '.join(words[:self.max_words]) + '...'
+        snippet = (
+            f"- {resource.title}\n"
+            f"  Description: {description}\n"
+            f"  Category: {resource.category}\n"
+            f"  URL: {resource.url}\n"
+        )
+        return snippet, estimate_tokens(snippet)
+
+    def rank(self, resources, query=None):
+        """Drop duplicates (same id or URL) and order by relevance to ``query``.
+
+        Without a query, or between equally relevant resources, the given
+        order is kept, so callers pass their most important resources first.
+        """
+        seen = set()
+        unique = []
+        for resource in resources:
+            if resource.id in seen or resource.url in seen:
+                continue
+            seen.add(resource.id)
+            if resource.url:
+                seen.add(resource.url)
+            unique.append(resource)
+
+        query_terms = _terms(query)
+        if not query_terms:
+            return unique
+
+        def score(resource):
+            return (
+                2 * len(query_terms & _terms(resource.title)) +
+                len(query_terms & _terms(resource.description))
+            )
+
+        # sorted() is stable, so ties keep the retrieval order
+        return sorted(unique, key=score, reverse=True)
+
+    def build(self, resources, budget, query=None):
+        """Render as many of the ranked resources as fit in ``budget`` tokens."""
+        if not resources:
+            return "No resources available."
+
+        parts = ["Available resources:"]
+        used = estimate_tokens(parts[0])
+        ranked = self.rank(resources, query)
+        included = 0
+        for resource in ranked:
+            snippet, tokens = self.render(resource)
+            if used + tokens > budget:
+                # Keep going, a shorter snippet further down may still fit
+                continue
+            parts.append(snippet)
+            used += tokens
+            included += 1
+
+        if included < len(ranked):
+            parts.append(f"({len(ranked) - included} more resources left out for length)")
+        return '\n'.join(parts)
+
+    def stats(self):
+        return self.snippets.stats()
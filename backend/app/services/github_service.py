@@ -1,8 +1,16 @@
-from github import Github
 from flask import current_app
-import requests
 from datetime import datetime, timedelta
+import math
 import os
+from app.utils.cache import TTLCache, normalize_query, app_context_loader
+from app.utils.fanout import current_deadline
+from app.utils.http import get_http_client
+from app.utils.singleflight import SingleFlight
+from app.utils.rate_limit import RateLimiter, RateLimitExceeded
+
+# GitHub only returns the first 1000 results of a search and at most 100 per page
+SEARCH_RESULT_LIMIT = 1000
+MAX_PER_PAGE = 100
 
 def truncate_text(text, max_words=50):
     """Truncate text to specified number of words and add ellipsis if needed."""
@@ -13,105 +21,161 @@ def truncate_text(text, max_words=50):
         return text
     return " ".join(words[:max_words]) + "..."
 
+def to_isoformat(timestamp):
+    """GitHub returns '2024-01-01T00:00:00Z', keep the '+00:00' form we always served."""
+    return timestamp.replace('Z', '+00:00') if timestamp else None
+
+def repo_to_dict(repo):
+    """Map a search API item to the shape served by the search routes."""
+    return {
+        'id': repo['id'],
+        'name': repo['name'],
+        'full_name': repo['full_name'],
+        'description': truncate_text(repo.get('description')),  # Truncate description
+        'url': repo['html_url'],
+        'stars': repo['stargazers_count'],
+        'language': repo.get('language'),
+        'created_at': to_isoformat(repo.get('created_at')),
+        'updated_at': to_isoformat(repo.get('updated_at')),
+        'type': 'github_repo'  # Add type field
+    }
+
 class GitHubService:
     def __init__(self):
+        self.base_url = 'https://api.github.com'
         self.token = None
-        self.github = None
+        self.headers = None
+        self.cache = None
+        self.flights = SingleFlight()
+        self.rate_limiter = None
+    
+    def _init_cache(self):
+        if self.cache is None:
+            self.cache = TTLCache(
+                maxsize=current_app.config.get('SEARCH_CACHE_MAX_ENTRIES', 512),
+                ttl=current_app.config.get('GITHUB_CACHE_TTL', 300),
+                stale_ttl=current_app.config.get('SEARCH_CACHE_STALE_TTL', 600)
+            )
     
     def _init_github(self):
-        if self.github is None:
+        if self.headers is None:
             # Try getting token from different sources
             self.token = current_app.config.get('GITHUB_API_TOKEN') or os.getenv('GITHUB_API_TOKEN')
-            print(f"Debug - GitHub Token Present: {'Yes' if self.token else 'No'}")
+            current_app.logger.debug(f"GitHub token present: {'yes' if self.token else 'no'}")
             
+            headers = {
+                'Accept': 'application/vnd.github+json',
+                'X-GitHub-Api-Version': '2022-11-28'
+            }
             # Only use token if it's actually set in config
             if self.token and self.token.strip():
-                print(f"Debug - Initializing GitHub client with token: {self.token[:4]}...")
-                self.github = Github(self.token)
-                print("Debug - GitHub client initialized with token")
-            else:
-                print("Debug - Initializing GitHub client without token")
-                self.github = Github()
-                print("Debug - GitHub client initialized without token")
+                headers['Authorization'] = f'Bearer {self.token.strip()}'
+            self.headers = headers
+            
+            # Every call we make is a search call, which has its own per-minute quota.
+            # The limit is corrected from the response headers after the first call.
+            authenticated = 'Authorization' in headers
+            self.rate_limiter = RateLimiter(
+                limit=current_app.config.get('GITHUB_SEARCH_RATE_LIMIT_AUTHENTICATED' if authenticated else 'GITHUB_SEARCH_RATE_LIMIT', 10),
+                window=60,
+                reserve=current_app.config.get('GITHUB_RATE_LIMIT_RESERVE', 1),
+                max_wait=current_app.config.get('GITHUB_RATE_LIMIT_MAX_WAIT', 2.0)
+            )
+    
+    def _search(self, query, page, per_page, max_wait=None):
+        """Run one search API request and return the decoded JSON body."""
+        self._init_github()
+        # Queue for a token or shed the call before GitHub would reject it
+        self.rate_limiter.acquire(max_wait)
+        response = get_http_client().get(
+            f'{self.base_url}/search/repositories',
+            params={
+                'q': query,
+                'sort': 'stars',
+                'order': 'desc',
+                'page': page,
+                'per_page': per_page
+            },
+            headers=self.headers,
+            deadline=current_deadline()
+        )
+        self.rate_limiter.update_from_headers(response.headers)
+        if response.status_code in (403, 429) and response.headers.get('X-RateLimit-Remaining') == '0':
+            reset_at = response.headers.get('X-RateLimit-Reset')
+            self.rate_limiter.mark_exhausted(int(reset_at) if reset_at and reset_at.isdigit() else None)
+            raise RateLimitExceeded("GitHub rate limit exceeded", retry_after=self.rate_limiter.budget()['reset_in'])
+        if response.status_code != 200:
+            try:
+                message = response.json().get('message', response.reason)
+            except ValueError:
+                message = response.reason
+            raise Exception(f"{response.status_code} {message}")
+        return response.json()
+    
+    def rate_limit_budget(self):
+        return self.rate_limiter.budget() if self.rate_limiter else None
+    
+    def cached_search(self, query, page=1, per_page=10):
+        """Last known result for a search regardless of age, None if never seen."""
+        self._init_cache()
+        return self.cache.peek((normalize_query(query), page, per_page))
     
     def search_repositories(self, query, page=1, per_page=10):
+        self._init_cache()
+        key = (normalize_query(query), page, per_page)
+        loader = app_context_loader(self._search_repositories, query, page, per_page)
+        # Concurrent misses for the same key share a single upstream call
+        return self.cache.get_or_load(key, loader, flights=self.flights)
+    
+    def _search_repositories(self, query, page=1, per_page=10):
         try:
-            self._init_github()
+            page = max(page or 1, 1)
+            per_page = min(max(per_page or 10, 1), MAX_PER_PAGE)
             
             # Make the query less restrictive - only add AI topics if no specific topic is mentioned
-            print(f"Debug - Initial query: {query}")
             if not query or query.strip() == "":
                 enhanced_query = "stars:>100 topic:artificial-intelligence OR topic:deep-learning OR topic:machine-learning OR topic:ai"
             else:
                 enhanced_query = f"{query.strip()} in:name,description,readme"
             
-            print(f"Debug - Searching GitHub with query: {enhanced_query}")
+            current_app.logger.debug(f"Searching GitHub with query: {enhanced_query} (page {page})")
             
-            repositories = self.github.search_repositories(
-                query=enhanced_query,
-                sort='stars',
-                order='desc'
-            )
+            # One request returns both the total count and the requested page
+            data = self._search(enhanced_query, page, per_page)
+            total_count = data.get('total_count', 0)
             
-            try:
-                # First try to get total count to check if we have results
-                total_count = repositories.totalCount
-                print(f"Debug - Found {total_count} repositories matching the query")
-                
-                if total_count == 0:
-                    print("Debug - No repositories found")
-                    return {
-                        'items': [],
-                        'total': 0,
-                        'pages': 0,
-                        'current_page': page
-                    }
-                
-                # Convert to list and get top 10 only
-                print("Debug - Converting results to list")
-                all_repos = list(repositories[:10])  # Only get top 10
-                actual_count = len(all_repos)
-                print(f"Debug - Successfully retrieved top {actual_count} repositories")
-                
-                results = []
-                for repo in all_repos:
-                    try:
-                        results.append({
-                            'id': repo.id,
-                            'name': repo.name,
-                            'full_name': repo.full_name,
-                            'description': truncate_text(repo.description),  # Truncate description
-                            'url': repo.html_url,
-                            'stars': repo.stargazers_count,
-                            'language': repo.language,
-                            'created_at': repo.created_at.isoformat(),
-                            'updated_at': repo.updated_at.isoformat(),
-                            'type': 'github_repo'  # Add type field
-                        })
-                    except Exception as e:
-                        print(f"Debug - Error processing repository: {str(e)}")
-                        continue
-                
-                print(f"Debug - Successfully processed {len(results)} repositories")
-                return {
-                    'items': results,
-                    'total': total_count,  # Keep total count to show total available
-                    'pages': 1,  # Since we're only showing top 10, we only have 1 page
-                    'current_page': 1
-                }
-                
-            except Exception as inner_e:
-                print(f"Debug - Error processing GitHub search results: {str(inner_e)}")
-                raise
+            results = []
+            for repo in data.get('items', []):
+                try:
+                    results.append(repo_to_dict(repo))
+                except KeyError as e:
+                    current_app.logger.debug(f"Skipping GitHub repository, missing {str(e)}")
+                    continue
             
+            return {
+                'items': results,
+                'total': total_count,  # Keep total count to show total available
+                'pages': math.ceil(min(total_count, SEARCH_RESULT_LIMIT) / per_page),
+                'current_page': page
+            }
+        
+        except RateLimitExceeded:
+            raise
         except Exception as e:
-            print(f"Debug - GitHub API error: {str(e)}")
+            current_app.logger.debug(f"GitHub API error: {str(e)}")
             raise Exception(f"Failed to fetch GitHub repositories: {str(e)}")
     
+    def fetch_topic_repositories(self, topic, page=1, per_page=100, max_wait=60):
+        """One page of popular repositories for a topic, for bulk ingestion.
+
+        Waits up to ``max_wait`` seconds for rate limit budget instead of the
+        short wait used for interactive searches.
+        """
+        data = self._search(f"topic:{topic} stars:>100", page, min(per_page, MAX_PER_PAGE), max_wait=max_wait)
+        return [repo_to_dict(repo) for repo in data.get('items', [])]
+    
     def get_trending_repositories(self):
         try:
-            self._init_github()
-            
             # Get repositories created in the last 7 days with stars
             date_threshold = datetime.now() - timedelta(days=7)
             date_str = date_threshold.strftime('%Y-%m-%d')
@@ -119,38 +183,25 @@ class GitHubService:
             # Construct a more specific query for trending AI repositories
             query = f"created:>={date_str} stars:>10 (artificial-intelligence OR deep-learning OR machine-learning OR ai) in:name,description,readme"
             
-            print(f"Debug - Trending query: {query}")
+            current_app.logger.debug(f"GitHub trending query: {query}")
             
-            repositories = self.github.search_repositories(
-                query=query,
-                sort='stars',
-                order='desc'
-            )
-            
-            # Convert to list and get top 10 safely
-            all_repos = list(repositories[:10])  # Only get top 10
-            print(f"Debug - Found {len(all_repos)} trending repositories")
+            # Only get top 10
+            data = self._search(query, 1, 10)
+            current_app.logger.debug(f"Found {len(data.get('items', []))} trending repositories")
             
             results = []
-            for repo in all_repos:
+            for repo in data.get('items', []):
                 try:
-                    results.append({
-                        'id': repo.id,
-                        'name': repo.name,
-                        'full_name': repo.full_name,
-                        'description': truncate_text(repo.description),  # Truncate description
-                        'url': repo.html_url,
-                        'stars': repo.stargazers_count,
-                        'language': repo.language,
-                        'created_at': repo.created_at.isoformat(),
-                        'type': 'github_repo'  # Add type field
-                    })
-                except Exception as e:
-                    print(f"Debug - Error processing trending repository: {str(e)}")
+                    results.append(repo_to_dict(repo))
+                except KeyError as e:
+                    current_app.logger.debug(f"Skipping trending repository, missing {str(e)}")
                     continue
             
             return results
-            
+        
+        except RateLimitExceeded:
+            # Not a failure of the data, let the caller keep what it has
+            raise
         except Exception as e:
-            print(f"Debug - GitHub API error: {str(e)}")
-            return [] 
\ No newline at end of file
+            current_app.logger.error(f"GitHub API error: {str(e)}")
+            return []
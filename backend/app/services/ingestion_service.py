@@ -0,0 +1,135 @@
+import json
+import re
+import time
+from datetime import datetime, timezone
+from flask import current_app
+from sqlalchemy.dialects import postgresql, sqlite
+from app.extensions import db
+from app.models import ExternalItem
+from app.services.arxiv_service import paper_to_dict
+
+# Same topics the GitHub search falls back to for an empty query
+GITHUB_TOPICS = ('artificial-intelligence', 'deep-learning', 'machine-learning', 'ai')
+
+# Columns refreshed when an item we already have is fetched again
+UPDATE_COLUMNS = ('title', 'description', 'url', 'published_at', 'stars', 'data', 'fetched_at')
+
+UPSERT_DIALECTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+
+def _parse_timestamp(value):
+    """ISO timestamp from GitHub/arXiv to a naive UTC datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _external_id(source, item):
+    if source == 'arxiv':
+        # 'http://arxiv.org/abs/2401.00001v2' -> '2401.00001', so new versions
+        # of a paper replace the old row
+        return re.sub(r'v\d+$', '', item['id'].rsplit('/abs/', 1)[-1])
+    return str(item['id'])
+
+
+class IngestionService:
+    """Pulls AI papers/repositories into the local external_item mirror."""
+
+    def __init__(self, github_service=None, arxiv_service=None):
+        self.github_service = github_service
+        self.arxiv_service = arxiv_service
+
+    def _to_row(self, source, item, description=None):
+        return {
+            'source': source,
+            'external_id': _external_id(source, item),
+            'title': item.get('full_name') or item.get('title') or '',
+            'description': description if description is not None else item.get('description'),
+            'url': item.get('url'),
+            'published_at': _parse_timestamp(item.get('published') or item.get('created_at')),
+            'stars': item.get('stars'),
+            'data': json.dumps(item),
+            'fetched_at': datetime.utcnow()
+        }
+
+    def upsert_items(self, source, items, descriptions=None, batch_size=500):
+        """Insert or refresh ``items`` (as served by the search routes) in bulk.
+
+        ``descriptions`` optionally maps item index to a longer text to index
+        than the truncated description in the item. Returns the row count.
+        """
+        rows = {}
+        for index, item in enumerate(items):
+            if not item.get('id'):
+                continue
+            description = descriptions[index] if descriptions else None
+            row = self._to_row(source, item, description)
+            rows[row['external_id']] = row  # last one wins within a batch
+        rows = list(rows.values())
+        if not rows:
+            return 0
+
+        insert = UPSERT_DIALECTS.get(db.engine.dialect.name)
+        if insert is not None:
+            for start in range(0, len(rows), batch_size):
+                stmt = insert(ExternalItem).values(rows[start:start + batch_size])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['source', 'external_id'],
+                    set_={column: stmt.excluded[column] for column in UPDATE_COLUMNS}
+                )
+                db.session.execute(stmt)
+        else:
+            existing = {
+                item.external_id: item for item in ExternalItem.query.filter(
+                    ExternalItem.source == source,
+                    ExternalItem.external_id.in_([row['external_id'] for row in rows])
+                )
+            }
+            for row in rows:
+                item = existing.get(row['external_id'])
+                if item is None:
+                    db.session.add(ExternalItem(**row))
+                else:
+                    for column in UPDATE_COLUMNS:
+                        setattr(item, column, row[column])
+
+        db.session.commit()
+        return len(rows)
+
+    def ingest_arxiv(self, total=1000, page_size=200, delay=3.0):
+        """Mirror the newest ``total`` papers across the AI categories."""
+        ingested = 0
+        for start in range(0, total, page_size):
+            papers = self.arxiv_service.fetch_ai_papers(start, min(page_size, total - start))
+            if not papers:
+                break
+            ingested += self.upsert_items(
+                'arxiv',
+                [paper_to_dict(paper) for paper in papers],
+                descriptions=[paper['summary'] for paper in papers]
+            )
+            current_app.logger.info(f"Ingested {ingested} arXiv papers")
+            # arXiv asks API clients to wait 3 seconds between calls
+            time.sleep(delay)
+        return ingested
+
+    def ingest_github(self, topics=GITHUB_TOPICS, pages=2, per_page=100):
+        """Mirror the most starred repositories for each AI topic."""
+        ingested = 0
+        for topic in topics:
+            for page in range(1, pages + 1):
+                repos = self.github_service.fetch_topic_repositories(topic, page, per_page)
+                ingested += self.upsert_items('github', repos)
+                current_app.logger.info(f"Ingested {ingested} GitHub repositories (topic {topic}, page {page})")
+                if len(repos) < per_page:
+                    break
+        return ingested
@@ -0,0 +1,39 @@
+from sqlalchemy import inspect
+from app.models import Bookmark, Resource
+from app.utils.http_cache import CatalogVersion
+from app.utils.invalidation import on_commit_after_change
+from app.utils.pagination import CountCache
+
+# Process-wide caches behind the resource and bookmark listings
+resource_counts = CountCache()
+bookmark_counts = CountCache()
+catalog_version = CatalogVersion(Resource)
+
+
+def changes_listing_counts(target, operation):
+    # Only approval and category changes move an existing resource between listings
+    if operation != 'update':
+        return True
+    state = inspect(target)
+    return state.attrs.is_approved.history.has_changes() or state.attrs.category.history.has_changes()
+
+
+def invalidate_catalog(count_changes):
+    catalog_version.invalidate()
+    if any(count_changes):
+        resource_counts.invalidate('resources')
+
+
+def invalidate_bookmark_counts(user_ids):
+    for user_id in set(user_ids):
+        bookmark_counts.invalidate(user_id)
+
+
+def register_invalidation():
+    """Clear the caches on committed writes, from any code path that uses db.session.
+
+    Called by the app factory, so jobs and scripts that never import the
+    blueprints keep them correct too.
+    """
+    on_commit_after_change(Resource, invalidate_catalog, record=changes_listing_counts)
+    on_commit_after_change(Bookmark, invalidate_bookmark_counts, record=lambda target, operation: target.user_id)
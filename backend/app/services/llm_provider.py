@@ -0,0 +1,123 @@
+import hashlib
+import time
+from abc import ABC, abstractmethod
+import google.generativeai as genai
+from flask import current_app
+from app.utils.tokens import estimate_tokens
+
+# Words the local provider builds its replies from
+LOCAL_VOCABULARY = (
+    'model', 'training', 'data', 'neural', 'network', 'gradient', 'learning', 'layer',
+    'attention', 'transformer', 'loss', 'embedding', 'feature', 'inference', 'dataset',
+    'optimizer', 'weights', 'batch', 'accuracy', 'regularization', 'the', 'a', 'of',
+    'and', 'to', 'with', 'for', 'is', 'can', 'helps'
+)
+
+
+class LLMProvider(ABC):
+    """Text generation backend used by ChatService.
+
+    ``contents`` is either a prompt string or a list of
+    ``{'role': 'user'|'model', 'parts': [text]}`` turns. A subclass missing
+    either method can't be instantiated, so it fails in ``create_provider``.
+    """
+
+    name = None
+
+    @abstractmethod
+    def generate(self, contents):
+        """Return the full reply text."""
+
+    @abstractmethod
+    def stream(self, contents):
+        """Yield ``(text, tokens)`` for each chunk of the reply as it is generated."""
+
+
+class GeminiProvider(LLMProvider):
+    name = 'gemini'
+
+    def __init__(self, api_key, model_name='gemini-2.0-flash'):
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, contents):
+        response = self.model.generate_content(contents)
+        return response.text if response else None
+
+    def stream(self, contents):
+        response = self.model.generate_content(contents, stream=True)
+        # A candidate's token_count is a running total for the reply so far,
+        # so each chunk counts the increase; estimate when it isn't reported
+        counted = 0
+        for chunk in response:
+            if not chunk.parts:
+                # Safety stops and metadata-only chunks, chunk.text would raise
+                continue
+            text = chunk.text
+            if not text:
+                continue
+            total = chunk.candidates[0].token_count if chunk.candidates else 0
+            token_count = max(total - counted, 0) if total else estimate_tokens(text)
+            counted += token_count
+            yield text, token_count
+
+
+class LocalProvider(LLMProvider):
+    """Offline stand-in for load tests: same input, same reply, simulated timing.
+
+    Waits ``latency`` seconds before the first token, then emits
+    ``tokens_per_second`` tokens per second until ``reply_tokens`` are out.
+    """
+
+    name = 'local'
+
+    def __init__(self, latency=0.5, tokens_per_second=50, reply_tokens=120):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.reply_tokens = reply_tokens
+
+    def _reply_words(self, contents):
+        if isinstance(contents, str):
+            prompt = contents
+        else:
+            prompt = '\n'.join(turn['parts'][0] for turn in contents)
+        seed = hashlib.sha256(prompt.encode()).digest()
+        return [
+            LOCAL_VOCABULARY[(seed[i % len(seed)] + i) % len(LOCAL_VOCABULARY)]
+            for i in range(self.reply_tokens)
+        ]
+
+    def generate(self, contents):
+        words = self._reply_words(contents)
+        time.sleep(self.latency + len(words) / self.tokens_per_second)
+        return ' '.join(words) + '.'
+
+    def stream(self, contents):
+        words = self._reply_words(contents)
+        time.sleep(self.latency)
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(1 / self.tokens_per_second)
+            yield (word if i == 0 else ' ' + word), 1
+
+
+def create_provider():
+    """Build the provider named by LLM_PROVIDER, None if it can't be configured."""
+    config = current_app.config
+    name = config.get('LLM_PROVIDER', 'gemini')
+
+    if name == 'local':
+        return LocalProvider(
+            latency=config.get('LOCAL_LLM_LATENCY', 0.5),
+            tokens_per_second=config.get('LOCAL_LLM_TOKENS_PER_SECOND', 50),
+            reply_tokens=config.get('LOCAL_LLM_REPLY_TOKENS', 120)
+        )
+
+    if name == 'gemini':
+        api_key = config.get('GOOGLE_API_KEY')
+        if not api_key:
+            current_app.logger.error("Google API key not found in configuration")
+            return None
+        return GeminiProvider(api_key, config.get('LLM_MODEL', 'gemini-2.0-flash'))
+
+    raise ValueError(f"Unknown LLM_PROVIDER '{name}'")
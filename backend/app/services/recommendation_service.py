@@ -0,0 +1,114 @@
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import current_app
+from app.extensions import db
+from app.models import Bookmark, UserRecommendation
+
+
+def bookmark_fingerprint(resource_ids):
+    """Hash of a user's bookmarked resource ids, independent of order."""
+    return hashlib.sha1(','.join(str(i) for i in sorted(resource_ids)).encode()).hexdigest()
+
+
+class RecommendationService:
+    """Serves stored per-user recommendations and recomputes them in the background.
+
+    Recommendations are stored with the fingerprint of the bookmark set they
+    were generated from. They are recomputed when that set changes, by a small
+    pool of workers, so page views never wait on Gemini.
+    """
+
+    def __init__(self, chat_service):
+        self.chat_service = chat_service
+        self.executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._stats = {'scheduled': 0, 'computed': 0, 'failed': 0, 'dropped': 0}
+
+    def _init_executor(self):
+        if self.executor is None:
+            with self._lock:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(
+                        max_workers=current_app.config.get('RECOMMENDATION_WORKERS', 2),
+                        thread_name_prefix='recommendations'
+                    )
+
+    def _bookmarked_ids(self, user_id):
+        return [
+            resource_id for (resource_id,) in
+            db.session.query(Bookmark.resource_id).filter_by(user_id=user_id)
+        ]
+
+    def get(self, user_id):
+        """Return ``(recommendation, status)`` for the user.
+
+        ``status`` is 'ready' when the stored recommendation matches the
+        current bookmarks, 'stale' when it is older (a recompute is queued)
+        and 'pending' when there is none yet (recommendation is None).
+        """
+        fingerprint = bookmark_fingerprint(self._bookmarked_ids(user_id))
+        recommendation = db.session.get(UserRecommendation, user_id)
+        if recommendation is not None and recommendation.fingerprint == fingerprint:
+            return recommendation, 'ready'
+
+        self.schedule(user_id)
+        return recommendation, 'stale' if recommendation is not None else 'pending'
+
+    def schedule(self, user_id):
+        """Queue a recompute for ``user_id`` unless one is already queued or the backlog is full."""
+        self._init_executor()
+        max_pending = current_app.config.get('RECOMMENDATION_MAX_PENDING', 100)
+        with self._lock:
+            if user_id in self._pending:
+                return
+            if len(self._pending) >= max_pending:
+                # The next page view schedules it again
+                self._stats['dropped'] += 1
+                return
+            self._pending.add(user_id)
+            self._stats['scheduled'] += 1
+
+        app = current_app._get_current_object()
+        self.executor.submit(self._recompute, app, user_id)
+
+    def _recompute(self, app, user_id):
+        with app.app_context():
+            try:
+                # Fingerprint what this run actually reads, a change made while
+                # it is running makes the result stale and triggers another run.
+                # Newest bookmarks come first, they get priority in the context budget.
+                bookmarks = Bookmark.query.filter_by(user_id=user_id).order_by(Bookmark.created_at.desc()).all()
+                fingerprint = bookmark_fingerprint([bookmark.resource_id for bookmark in bookmarks])
+                result = self.chat_service.get_recommendations([bookmark.resource for bookmark in bookmarks])
+                if not isinstance(result, dict) or 'response' not in result:
+                    raise RuntimeError(f"Gemini returned no recommendations: {result}")
+
+                recommendation = db.session.get(UserRecommendation, user_id)
+                if recommendation is None:
+                    recommendation = UserRecommendation(user_id=user_id)
+                    db.session.add(recommendation)
+                recommendation.fingerprint = fingerprint
+                recommendation.content = result['response']
+                recommendation.computed_at = datetime.utcnow()
+                db.session.commit()
+                self._count('computed')
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.error(f"Failed to compute recommendations for user {user_id}: {str(e)}")
+                self._count('failed')
+            finally:
+                with self._lock:
+                    self._pending.discard(user_id)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+        return stats
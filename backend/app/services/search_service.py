@@ -0,0 +1,270 @@
+import math
+import re
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import bindparam, text
+from app.extensions import db
+from app.models import Resource, ExternalItem
+from app.utils.cache import TTLCache, normalize_query
+from app.utils.serializers import resource_rows, resource_serializer
+
+FTS_TABLE = 'resource_fts'
+EXTERNAL_FTS_TABLE = 'external_item_fts'
+
+
+def fts_ddl(table, columns):
+    """Statements for an external-content FTS5 index on ``table`` plus its sync triggers."""
+    fts = f'{table}_fts'
+    cols = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols},
+            content='{table}', content_rowid='id',
+            tokenize='porter unicode61'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});
+        END""",
+    ]
+
+
+# Kept in sync with the FTS migrations. Used by init_db.py, which builds the
+# schema with db.create_all() instead of running migrations.
+FTS_INDEXES = {
+    FTS_TABLE: fts_ddl('resource', ('title', 'description', 'category')),
+    EXTERNAL_FTS_TABLE: fts_ddl('external_item', ('title', 'description')),
+}
+
+# bm25() column weights: a hit in the title counts more than one in the description
+BM25_WEIGHTS = (10.0, 5.0, 2.0)
+EXTERNAL_BM25_WEIGHTS = (10.0, 5.0)
+
+# Mirror hits come back in the order of the live API, GitHub by stars and arXiv
+# newest first, with bm25 relevance breaking ties
+EXTERNAL_ORDER = {
+    'github': ('e.stars DESC', ExternalItem.stars.desc()),
+    'arxiv': ('e.published_at DESC', ExternalItem.published_at.desc()),
+}
+
+
+class SearchResults:
+    """Page of search hits with the same attributes as a Flask-SQLAlchemy Pagination."""
+
+    def __init__(self, items, total, page, per_page):
+        self.items = items
+        self.total = total
+        self.page = page
+        self.per_page = per_page
+
+    @property
+    def pages(self):
+        if not self.per_page or not self.total:
+            return 0 if not self.total else 1
+        return int(math.ceil(self.total / float(self.per_page)))
+
+
+class SearchService:
+    def __init__(self):
+        self._fts_tables = None
+        self.mirror_decisions = None
+        self._lock = threading.Lock()
+
+    def _init_mirror_decisions(self):
+        if self.mirror_decisions is None:
+            with self._lock:
+                if self.mirror_decisions is None:
+                    self.mirror_decisions = TTLCache(
+                        maxsize=current_app.config.get('MIRROR_DECISION_CACHE_SIZE', 1000),
+                        ttl=current_app.config.get('MIRROR_DECISION_TTL', 600)
+                    )
+        return self.mirror_decisions
+
+    def _use_fts(self, table=FTS_TABLE):
+        if self._fts_tables is None:
+            if db.engine.dialect.name != 'sqlite':
+                self._fts_tables = set()
+            else:
+                rows = db.session.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'table' AND name IN :names")
+                    .bindparams(bindparam('names', expanding=True)),
+                    {'names': list(FTS_INDEXES)}
+                )
+                self._fts_tables = {row[0] for row in rows}
+            if not self._fts_tables:
+                current_app.logger.info("FTS5 index not available, falling back to ilike search")
+        return table in self._fts_tables
+
+    def ensure_index(self):
+        """Create the FTS5 tables and their sync triggers if missing, then rebuild them."""
+        if db.engine.dialect.name != 'sqlite':
+            return False
+        for fts, statements in FTS_INDEXES.items():
+            for statement in statements:
+                db.session.execute(text(statement))
+            db.session.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        db.session.commit()
+        self._fts_tables = set(FTS_INDEXES)
+        return True
+
+    @staticmethod
+    def _build_match(query):
+        # Quote every token so user input can't inject FTS5 syntax, and match
+        # prefixes so results show up while the user is still typing.
+        terms = re.findall(r'\w+', query.lower())
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, query, approved_only=False, page=1, per_page=None, with_total=True, as_rows=False):
+        """Return resources matching ``query``, best match first.
+
+        ``per_page=None`` returns every hit. ``with_total=False`` skips the
+        count query for callers that only want the top hits. ``as_rows=True``
+        returns column tuples for ``resource_rows.dump`` instead of Resource
+        objects, for callers that only serialize them.
+        """
+        page = max(page or 1, 1)
+        match = self._build_match(query or '')
+        # Queries without any word characters (including the empty query) keep
+        # the old substring semantics
+        if match and self._use_fts(FTS_TABLE):
+            return self._search_fts(match, approved_only, page, per_page, with_total, as_rows)
+        return self._search_ilike(query or '', approved_only, page, per_page, with_total, as_rows)
+
+    @staticmethod
+    def _load(query, as_rows):
+        return resource_rows.project(query) if as_rows else resource_serializer.apply(query)
+
+    def _search_fts(self, match, approved_only, page, per_page, with_total, as_rows):
+        where = f"{FTS_TABLE} MATCH :match"
+        if approved_only:
+            where += " AND r.is_approved = 1"
+        params = {'match': match}
+
+        sql = (
+            f"SELECT r.id FROM {FTS_TABLE} JOIN resource r ON r.id = {FTS_TABLE}.rowid "
+            f"WHERE {where} "
+            f"ORDER BY bm25({FTS_TABLE}, {', '.join(str(w) for w in BM25_WEIGHTS)})"
+        )
+        if per_page:
+            sql += " LIMIT :limit OFFSET :offset"
+            params.update({'limit': per_page, 'offset': (page - 1) * per_page})
+
+        ids = [row[0] for row in db.session.execute(text(sql), params)]
+
+        if ids:
+            by_id = {
+                resource.id: resource
+                for resource in self._load(Resource.query.filter(Resource.id.in_(ids)), as_rows)
+            }
+            items = [by_id[i] for i in ids if i in by_id]
+        else:
+            items = []
+
+        if not per_page:
+            total = len(items)
+        elif with_total:
+            total = db.session.execute(
+                text(f"SELECT count(*) FROM {FTS_TABLE} JOIN resource r ON r.id = {FTS_TABLE}.rowid WHERE {where}"),
+                {'match': match}
+            ).scalar()
+        else:
+            total = None
+
+        return SearchResults(items, total, page, per_page)
+
+    def _search_ilike(self, query, approved_only, page, per_page, with_total, as_rows):
+        filters = [
+            Resource.title.ilike(f'%{query}%') |
+            Resource.description.ilike(f'%{query}%')
+        ]
+        if approved_only:
+            filters.append(Resource.is_approved == True)
+
+        results = self._load(Resource.query.filter(*filters), as_rows).order_by(Resource.created_at.desc())
+
+        if not per_page:
+            items = results.all()
+            return SearchResults(items, len(items), page, per_page)
+
+        paginated = results.paginate(page=page, per_page=per_page, error_out=False, count=with_total)
+        return SearchResults(paginated.items, paginated.total, paginated.page, per_page)
+
+    def mirror_cutoff(self, source, query):
+        """Oldest ``fetched_at`` to answer ``query`` from the mirror with, None to go live.
+
+        The mirror is used when it has MIRROR_MIN_RESULTS hits fetched within
+        MIRROR_MAX_AGE seconds. The choice and its cutoff are kept for
+        MIRROR_DECISION_TTL seconds per query, not made per page, so all pages
+        of a walk come from the same side with the same total.
+        """
+        config = current_app.config
+        min_results = config.get('MIRROR_MIN_RESULTS', 0)
+        if not min_results:
+            return None
+
+        def decide():
+            fresh_since = datetime.utcnow() - timedelta(seconds=config.get('MIRROR_MAX_AGE', 86400))
+            fresh = self.search_external(source, query, per_page=1, fresh_since=fresh_since)
+            return fresh_since if fresh.total >= min_results else None
+
+        return self._init_mirror_decisions().get_or_load((source, normalize_query(query)), decide)
+
+    def search_external(self, source, query, page=1, per_page=10, fresh_since=None):
+        """Search the local mirror of GitHub/arXiv results for ``source``.
+
+        ``fresh_since`` leaves out items last fetched before that time.
+        """
+        page = max(page or 1, 1)
+        match = self._build_match(query or '')
+        if not match:
+            return SearchResults([], 0, page, per_page)
+        order_sql, order_by = EXTERNAL_ORDER.get(source, (None, None))
+
+        if not self._use_fts(EXTERNAL_FTS_TABLE):
+            results = ExternalItem.query.filter(
+                ExternalItem.source == source,
+                ExternalItem.title.ilike(f'%{query}%') |
+                ExternalItem.description.ilike(f'%{query}%')
+            )
+            if fresh_since is not None:
+                results = results.filter(ExternalItem.fetched_at >= fresh_since)
+            results = results.order_by(
+                order_by if order_by is not None else ExternalItem.published_at.desc()
+            ).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            return SearchResults(results.items, results.total, results.page, per_page)
+
+        where = f"{EXTERNAL_FTS_TABLE} MATCH :match AND e.source = :source"
+        join = f"FROM {EXTERNAL_FTS_TABLE} JOIN external_item e ON e.id = {EXTERNAL_FTS_TABLE}.rowid"
+        params = {'match': match, 'source': source}
+        if fresh_since is not None:
+            where += " AND e.fetched_at >= :fresh_since"
+            params['fresh_since'] = fresh_since
+        bm25 = f"bm25({EXTERNAL_FTS_TABLE}, {', '.join(str(w) for w in EXTERNAL_BM25_WEIGHTS)})"
+
+        ids = [row[0] for row in db.session.execute(
+            text(
+                f"SELECT e.id {join} WHERE {where} "
+                f"ORDER BY {f'{order_sql}, ' if order_sql else ''}{bm25} "
+                f"LIMIT :limit OFFSET :offset"
+            ),
+            dict(params, limit=per_page, offset=(page - 1) * per_page)
+        )]
+        if ids:
+            by_id = {item.id: item for item in ExternalItem.query.filter(ExternalItem.id.in_(ids))}
+            items = [by_id[i] for i in ids if i in by_id]
+        else:
+            items = []
+
+        total = db.session.execute(text(f"SELECT count(*) {join} WHERE {where}"), params).scalar()
+        return SearchResults(items, total, page, per_page)
@@ -0,0 +1,270 @@
+import math
+import re
+import threading
+import zlib
+from functools import lru_cache
+import numpy as np
+from flask import current_app
+from app.extensions import db
+from app.models import Resource
+from app.services.listing_cache import catalog_version
+from app.utils.serializers import resource_serializer
+
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'in', 'is',
+    'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'what', 'with', 'you', 'your'
+))
+
+
+# Stripped by stem(), longest first
+SUFFIXES = ('ings', 'ing', 'ions', 'ion', 'ers', 'er', 'ed', 'es', 'e', 's')
+
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    """Crude suffix stripping so 'translate', 'translation' and 'translating' meet."""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    """Stemmed words plus adjacent word pairs, so phrases weigh more than loose words."""
+    words = [stem(word) for word in re.findall(r'\w+', (text or '').lower()) if word not in STOP_WORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+@lru_cache(maxsize=65536)
+def _hash(token):
+    return zlib.crc32(token.encode())
+
+
+def token_hashes(text):
+    return [_hash(token) for token in tokenize(text)]
+
+
+class SemanticIndex:
+    """In-memory vector index over resource text, top-k by cosine similarity.
+
+    Texts are embedded with signed feature hashing of TF-IDF weighted words
+    and word pairs into ``dim`` dimensions, so similar wording lands close
+    together without a model download. Vectors live in one float32 matrix
+    stored column by column: a query only has a handful of non-zero
+    dimensions, so scoring reads just those columns before ``argpartition``
+    picks the top k.
+
+    IDF weights are updated as documents come and go, but vectors already
+    in the matrix keep the weights they were embedded with until the next
+    ``build``.
+    """
+
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.matrix = np.zeros((0, dim), dtype=np.float32, order='F')
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.size = 0
+        self.row_of = {}
+        self.loaded = False
+
+        # Documents containing each hashed token, for IDF
+        self.doc_freq = {}
+        self.doc_tokens = {}
+
+        self._lock = threading.RLock()
+
+    def _idf(self, token_hash):
+        return math.log((1 + self.size) / (1 + self.doc_freq.get(token_hash, 0))) + 1
+
+    def embed(self, hashes, known_only=False):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        counts = {}
+        for token_hash in hashes:
+            if known_only and token_hash not in self.doc_freq:
+                # Can't match anything, it would only add hash collisions
+                continue
+            counts[token_hash] = counts.get(token_hash, 0) + 1
+        for token_hash, count in counts.items():
+            sign = 1.0 if token_hash & 1 else -1.0
+            vector[(token_hash >> 1) % self.dim] += sign * (1 + math.log(count)) * self._idf(token_hash)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def build(self, documents):
+        """Replace the index with ``documents``, an iterable of ``(id, text)``."""
+        documents = [(doc_id, token_hashes(text)) for doc_id, text in documents]
+        with self._lock:
+            self.doc_freq = {}
+            self.doc_tokens = {}
+            for doc_id, hashes in documents:
+                hashes = set(hashes)
+                self.doc_tokens[doc_id] = hashes
+                for token_hash in hashes:
+                    self.doc_freq[token_hash] = self.doc_freq.get(token_hash, 0) + 1
+
+            self.size = len(documents)
+            # Embed row by row, then lay the matrix out column by column in one copy
+            matrix = np.zeros((max(self.size, 16), self.dim), dtype=np.float32)
+            self.ids = np.zeros(len(matrix), dtype=np.int64)
+            self.row_of = {}
+            for row, (doc_id, hashes) in enumerate(documents):
+                matrix[row] = self.embed(hashes)
+                self.ids[row] = doc_id
+                self.row_of[doc_id] = row
+            self.matrix = np.asfortranarray(matrix)
+            self.loaded = True
+
+    def upsert(self, doc_id, text):
+        hashes = token_hashes(text)
+        with self._lock:
+            self._forget_tokens(doc_id)
+            self.doc_tokens[doc_id] = set(hashes)
+            for token_hash in self.doc_tokens[doc_id]:
+                self.doc_freq[token_hash] = self.doc_freq.get(token_hash, 0) + 1
+
+            row = self.row_of.get(doc_id)
+            if row is None:
+                if self.size == len(self.matrix):
+                    # Grow by doubling so appends stay amortized O(dim)
+                    capacity = max(2 * len(self.matrix), 16)
+                    matrix = np.zeros((capacity, self.dim), dtype=np.float32, order='F')
+                    matrix[:self.size] = self.matrix[:self.size]
+                    self.matrix = matrix
+                    self.ids = np.resize(self.ids, capacity)
+                row = self.size
+                self.size += 1
+                self.row_of[doc_id] = row
+                self.ids[row] = doc_id
+            self.matrix[row] = self.embed(hashes)
+
+    def remove(self, doc_id):
+        with self._lock:
+            row = self.row_of.pop(doc_id, None)
+            if row is None:
+                return
+            self._forget_tokens(doc_id)
+            # Move the last row into the hole so rows stay contiguous
+            last = self.size - 1
+            if row != last:
+                self.matrix[row] = self.matrix[last]
+                self.ids[row] = self.ids[last]
+                self.row_of[int(self.ids[row])] = row
+            self.size = last
+
+    def _forget_tokens(self, doc_id):
+        for token_hash in self.doc_tokens.pop(doc_id, ()):
+            remaining = self.doc_freq[token_hash] - 1
+            if remaining:
+                self.doc_freq[token_hash] = remaining
+            else:
+                del self.doc_freq[token_hash]
+
+    def query(self, text, k=10, min_score=0.0):
+        """Return up to ``k`` ``(id, score)`` pairs, best first."""
+        with self._lock:
+            if not self.size:
+                return []
+            vector = self.embed(token_hashes(text), known_only=True)
+            columns = np.flatnonzero(vector)
+            if not len(columns):
+                return []
+            scores = self.matrix[:self.size, columns] @ vector[columns]
+            k = min(k, self.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                (int(self.ids[row]), float(scores[row]))
+                for row in top if scores[row] > min_score
+            ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'documents': self.size,
+                'dim': self.dim,
+                'capacity': len(self.matrix),
+                'vocabulary_buckets': len(self.doc_freq),
+                'matrix_bytes': self.matrix.nbytes
+            }
+
+
+def resource_text(title, description):
+    # Titles count twice, they are the most specific text we have
+    return f"{title} {title} {description or ''}"
+
+
+class SemanticSearchService:
+    """Keeps a SemanticIndex of approved resources in sync with the database.
+
+    Committed writes from this process are applied to the index in place.
+    Writes from other workers only show up in the shared catalog version,
+    so the index is rebuilt whenever that moves for any other reason, at
+    most ``CATALOG_VERSION_TTL`` after the write.
+    """
+
+    def __init__(self):
+        self.index = None
+        self.version = None
+        self._applied_local = False
+        self._build_lock = threading.Lock()
+
+    def _init_index(self):
+        version = catalog_version.current()
+        with self._build_lock:
+            if self._applied_local:
+                # The version moved for writes already applied in place
+                self.version = version
+                self._applied_local = False
+            if self.index is None or self.version != version:
+                index = SemanticIndex(dim=current_app.config.get('SEMANTIC_INDEX_DIM', 256))
+                rows = db.session.query(Resource.id, Resource.title, Resource.description).filter(
+                    Resource.is_approved.is_(True)
+                )
+                index.build((resource_id, resource_text(title, description)) for resource_id, title, description in rows)
+                current_app.logger.info(f"Semantic index built with {index.size} resources")
+                self.index = index
+                self.version = version
+        return self.index
+
+    def search(self, query, limit=10):
+        """Approved resources most similar to ``query`` as ``[(resource, score)]``, best first."""
+        hits = self._init_index().query(
+            query, k=limit, min_score=current_app.config.get('SEMANTIC_MIN_SCORE', 0.1)
+        )
+        if not hits:
+            return []
+        resources = {
+            resource.id: resource
+            for resource in resource_serializer.apply(
+                Resource.query.filter(
+                    Resource.id.in_([resource_id for resource_id, _ in hits]),
+                    Resource.is_approved.is_(True)
+                )
+            )
+        }
+        return [(resources[resource_id], score) for resource_id, score in hits if resource_id in resources]
+
+    def apply_changes(self, changes):
+        """Apply committed changes, ``{id: (title, description, is_approved) or None if deleted}``."""
+        # Under the build lock, so changes racing a rebuild land in the new index
+        with self._build_lock:
+            if self.index is None:
+                # Nothing built yet, the first search reads the current rows
+                return
+            for resource_id, row in changes.items():
+                if row is None or not row[2]:
+                    self.index.remove(resource_id)
+                else:
+                    self.index.upsert(resource_id, resource_text(row[0], row[1]))
+            self._applied_local = True
+
+    def stats(self):
+        return self.index.stats() if self.index else None
+
+
+_semantic_search_service = SemanticSearchService()
+
+
+def get_semantic_search():
+    """Process-wide semantic search, shared by the search and chat routes."""
+    return _semantic_search_service
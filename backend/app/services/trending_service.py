@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from app.utils.rate_limit import RateLimitExceeded
+
+
+class TrendingService:
+    """Keeps the trending GitHub repositories and arXiv papers precomputed.
+
+    A background thread refreshes both lists every TRENDING_REFRESH_INTERVAL
+    seconds. The latest snapshot is held in memory and written to
+    TRENDING_SNAPSHOT_PATH so a restarted worker can serve it right away.
+    """
+
+    def __init__(self, github_service, arxiv_service):
+        self.github_service = github_service
+        self.arxiv_service = arxiv_service
+        self.app = None
+        self.snapshot = {'github': [], 'arxiv': [], 'refreshed_at': None}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        # Earliest time.monotonic() for the next inline refresh after a failed one
+        self._retry_at = 0.0
+
+    def init_app(self, app):
+        self.app = app
+        self._load_snapshot()
+
+        # Start the scheduler with the first request rather than at import
+        # time, so CLI commands and scripts don't hit the network.
+        @app.before_request
+        def start_trending_scheduler():
+            self.start()
+
+    def start(self):
+        if self._thread is not None or self.app.config.get('TRENDING_REFRESH_INTERVAL', 0) <= 0:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='trending-refresh', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        interval = self.app.config['TRENDING_REFRESH_INTERVAL']
+        while not self._stop.is_set():
+            with self.app.app_context():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    current_app.logger.error(f"Trending refresh failed: {str(e)}")
+            self._stop.wait(interval)
+
+    def refresh(self):
+        """Recompute both trending lists and publish them as the new snapshot.
+
+        When neither source returns anything the previous snapshot, and its
+        ``refreshed_at``, stay as they are.
+        """
+        with self._refresh_lock:
+            started = time.monotonic()
+            try:
+                github = self.github_service.get_trending_repositories()
+            except RateLimitExceeded as e:
+                current_app.logger.warning(f"Trending repositories not refreshed: {str(e)}")
+                github = []
+            arxiv = self.arxiv_service.get_trending_papers()
+
+            if not github and not arxiv:
+                self._retry_at = time.monotonic() + current_app.config.get('TRENDING_RETRY_BACKOFF', 60)
+                current_app.logger.warning("Trending refresh got nothing from either source, keeping the previous snapshot")
+                return self.snapshot
+
+            with self._lock:
+                # Both lists are empty when the upstream call failed, keep
+                # serving the previous list in that case
+                snapshot = {
+                    'github': github or self.snapshot['github'],
+                    'arxiv': arxiv or self.snapshot['arxiv'],
+                    'refreshed_at': datetime.utcnow().isoformat()
+                }
+                self.snapshot = snapshot
+
+            self._save_snapshot(snapshot)
+            current_app.logger.info(
+                f"Trending snapshot refreshed in {time.monotonic() - started:.2f}s "
+                f"({len(snapshot['github'])} repositories, {len(snapshot['arxiv'])} papers)"
+            )
+            return snapshot
+
+    def get(self, source):
+        """Return ``(items, refreshed_at)`` for 'github' or 'arxiv'."""
+        if self.snapshot['refreshed_at'] is None and self._thread is None and time.monotonic() >= self._retry_at:
+            # Scheduler disabled and nothing on disk yet, compute it inline
+            self.refresh()
+        snapshot = self.snapshot
+        return snapshot[source], snapshot['refreshed_at']
+
+    def _snapshot_path(self):
+        return self.app.config.get('TRENDING_SNAPSHOT_PATH')
+
+    def _load_snapshot(self):
+        path = self._snapshot_path()
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            self.snapshot = {
+                'github': data.get('github', []),
+                'arxiv': data.get('arxiv', []),
+                'refreshed_at': data.get('refreshed_at')
+            }
+        except (OSError, ValueError) as e:
+            self.app.logger.warning(f"Could not load trending snapshot from {path}: {str(e)}")
+
+    def _save_snapshot(self, snapshot):
+        path = self._snapshot_path()
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see a partial file,
+            # a unique one so workers saving at the same time don't interleave
+            tmp = tempfile.NamedTemporaryFile('w', dir=os.path.dirname(path), suffix='.tmp', delete=False)
+            try:
+                with tmp:
+                    json.dump(snapshot, tmp)
+                os.replace(tmp.name, path)
+            except OSError:
+                os.remove(tmp.name)
+                raise
+        except OSError as e:
+            current_app.logger.warning(f"Could not save trending snapshot to {path}: {str(e)}")
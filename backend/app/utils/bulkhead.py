@@ -0,0 +1,144 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class BulkheadFull(Exception):
+    """Raised when a call can't get a slot, the queue is full or its wait ran out."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Bulkhead:
+    """Caps how many slow calls (e.g. to an LLM) run at once.
+
+    At most ``max_concurrent`` callers hold a slot. Up to ``max_queue`` more
+    wait for one, each for at most ``max_wait`` seconds. Anyone beyond that
+    is turned away at once with BulkheadFull, so a burst of slow calls can't
+    tie up every web worker.
+    """
+
+    def __init__(self, max_concurrent, max_queue=0, max_wait=0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.queued = 0
+
+        # Moving average of how long a slot is held, used for Retry-After
+        self.avg_hold = None
+
+        self._cond = threading.Condition()
+        self._stats = {
+            'admitted': 0,
+            'rejected': 0,
+            'timed_out': 0,
+            'peak_in_flight': 0,
+            'peak_queued': 0,
+            'total_wait': 0.0,
+            'max_wait': 0.0
+        }
+
+    def _retry_after(self):
+        return max(self.avg_hold or 1.0, 1.0)
+
+    def acquire(self, max_wait=None):
+        """Take a slot, waiting in the queue if needed. Returns the time waited."""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        started = time.monotonic()
+
+        with self._cond:
+            if self.in_flight >= self.max_concurrent:
+                if self.queued >= self.max_queue:
+                    self._stats['rejected'] += 1
+                    raise BulkheadFull("Too many calls in progress", retry_after=self._retry_after())
+
+                self.queued += 1
+                self._stats['peak_queued'] = max(self._stats['peak_queued'], self.queued)
+                deadline = started + max_wait
+                try:
+                    while self.in_flight >= self.max_concurrent:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._stats['timed_out'] += 1
+                            raise BulkheadFull(
+                                f"No slot free within {max_wait}s", retry_after=self._retry_after()
+                            )
+                        self._cond.wait(remaining)
+                finally:
+                    self.queued -= 1
+
+            self.in_flight += 1
+            waited = time.monotonic() - started
+            self._stats['admitted'] += 1
+            self._stats['peak_in_flight'] = max(self._stats['peak_in_flight'], self.in_flight)
+            self._stats['total_wait'] += waited
+            self._stats['max_wait'] = max(self._stats['max_wait'], waited)
+        return waited
+
+    def release(self, held=None):
+        with self._cond:
+            self.in_flight -= 1
+            if held is not None:
+                self.avg_hold = held if self.avg_hold is None else 0.8 * self.avg_hold + 0.2 * held
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, max_wait=None):
+        self.acquire(max_wait)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    def hold(self, iterable):
+        """Wrap ``iterable`` so the slot already acquired by the caller is released
+        once it is exhausted, fails or is closed, whichever happens first."""
+        return _HeldIterator(self, iterable)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats['in_flight'] = self.in_flight
+            stats['queued'] = self.queued
+            stats['max_concurrent'] = self.max_concurrent
+            stats['max_queue'] = self.max_queue
+            stats['avg_hold_s'] = round(self.avg_hold, 3) if self.avg_hold is not None else None
+        stats['avg_wait_ms'] = round(stats['total_wait'] / stats['admitted'] * 1000, 1) if stats['admitted'] else 0.0
+        stats['max_wait_ms'] = round(stats.pop('max_wait') * 1000, 1)
+        del stats['total_wait']
+        return stats
+
+
+class _HeldIterator:
+    def __init__(self, bulkhead, iterable):
+        self._bulkhead = bulkhead
+        self._iterator = iter(iterable)
+        self._started = time.monotonic()
+        self._released = False
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._iterator)
+        except BaseException:
+            # StopIteration included
+            self.close()
+            raise
+
+    def close(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        try:
+            if hasattr(self._iterator, 'close'):
+                self._iterator.close()
+        finally:
+            self._bulkhead.release(time.monotonic() - self._started)
@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+
+def normalize_query(query):
+    """Cache key form of a search query: lower case, collapsed whitespace."""
+    return ' '.join((query or '').lower().split())
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a per-entry TTL and stale-while-revalidate.
+
+    Entries younger than ``ttl`` are served as is. Entries older than ``ttl``
+    but younger than ``ttl + stale_ttl`` are still served while a background
+    thread reloads them. Anything older is treated as a miss.
+    """
+
+    def __init__(self, maxsize=512, ttl=300, stale_ttl=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'evictions': 0
+        }
+
+    def get(self, key):
+        """Return ``(value, state)`` where state is 'fresh', 'stale' or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age <= self.ttl:
+                self._entries.move_to_end(key)
+                return value, 'fresh'
+            if age <= self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                return value, 'stale'
+            # Expired entries stay until LRU eviction so peek() can still
+            # serve them when the upstream is unavailable
+            return None, None
+
+    def peek(self, key):
+        """Return the stored value however old it is, without touching counters or LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_load(self, key, loader, flights=None):
+        """Return the cached value for ``key``, calling ``loader()`` on a miss.
+
+        With ``flights`` (a SingleFlight), concurrent misses for ``key`` share
+        one ``loader()`` call. The value is stored before that flight ends and
+        the cache is checked again inside it, so a caller that missed just as
+        a load finished gets the stored value instead of loading again.
+
+        Exceptions raised by ``loader`` propagate and nothing is cached.
+        """
+        value, state = self.get(key)
+        if state == 'fresh':
+            self._count('hits')
+            return value
+        if state == 'stale':
+            self._count('stale_hits')
+            self._refresh_in_background(key, loader if flights is None else lambda: flights.do(key, loader))
+            return value
+
+        self._count('misses')
+        if flights is not None:
+            return flights.do(key, lambda: self._load(key, loader))
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def _load(self, key, loader):
+        value, state = self.get(key)
+        if state == 'fresh':
+            return value
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.set(key, loader())
+                self._count('refreshes')
+            except Exception:
+                # Keep serving the stale value until it ages out
+                self._count('refresh_errors')
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+            stats['maxsize'] = self.maxsize
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['stale_hits']) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+def app_context_loader(func, *args, **kwargs):
+    """Bind ``func`` to the current app so it can also run from a refresh thread."""
+    app = current_app._get_current_object()
+
+    def load():
+        with app.app_context():
+            return func(*args, **kwargs)
+
+    return load
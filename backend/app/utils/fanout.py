@@ -0,0 +1,117 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from flask import current_app, g, has_app_context
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Shared, bounded pool used to run the upstream sources side by side."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get('SEARCH_FANOUT_WORKERS', 8),
+                    thread_name_prefix='search-fanout'
+                )
+    return _executor
+
+
+def current_deadline():
+    """``time.monotonic()`` deadline of the fan-out source running on this thread, if any."""
+    return g.get('fanout_deadline') if has_app_context() else None
+
+
+def _run_in_context(app, func, deadline):
+    # Each source runs in its own app context so it gets its own DB session,
+    # and its deadline travels with it down to the HTTP client
+    with app.app_context():
+        g.fanout_deadline = deadline
+        result = func()
+    return result, time.monotonic()
+
+
+def _failed(name, error, started):
+    current_app.logger.error(f"Search source '{name}' failed: {str(error)}")
+    return {
+        'status': 'error',
+        'error': str(error),
+        'latency_ms': round((time.monotonic() - started) * 1000, 1)
+    }
+
+
+def iter_fan_out(tasks, timeouts, default_timeout=5.0, inline=()):
+    """Run ``tasks`` ({name: callable}) concurrently, each with its own deadline.
+
+    Yields ``(name, result, source)`` in completion order, where ``source`` is
+    a status/latency entry and ``result`` is None unless the status is 'ok'.
+    Tasks named in ``inline`` run on the calling thread while the others are
+    in the pool, so they never queue behind slow upstreams; they have no
+    deadline. A pooled task that misses its deadline is no longer waited on,
+    and its HTTP calls give up when the deadline passes (see
+    ``current_deadline``).
+    """
+    app = current_app._get_current_object()
+    executor = get_executor()
+
+    started = time.monotonic()
+    deadlines = {name: started + timeouts.get(name, default_timeout) for name in tasks if name not in inline}
+    futures = {executor.submit(_run_in_context, app, tasks[name], deadline): name for name, deadline in deadlines.items()}
+
+    for name in inline:
+        try:
+            result = tasks[name]()
+        except Exception as e:
+            yield name, None, _failed(name, e, started)
+        else:
+            yield name, result, {
+                'status': 'ok',
+                'latency_ms': round((time.monotonic() - started) * 1000, 1)
+            }
+
+    pending = set(futures)
+    while pending:
+        next_deadline = min(deadlines[futures[future]] for future in pending)
+        done, _ = wait(pending, timeout=max(next_deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            pending.discard(future)
+            name = futures[future]
+            try:
+                result, finished = future.result()
+            except Exception as e:
+                yield name, None, _failed(name, e, started)
+            else:
+                yield name, result, {
+                    'status': 'ok',
+                    'latency_ms': round((finished - started) * 1000, 1)
+                }
+
+        now = time.monotonic()
+        for future in [future for future in pending if deadlines[futures[future]] <= now]:
+            pending.discard(future)
+            future.cancel()
+            name = futures[future]
+            current_app.logger.warning(f"Search source '{name}' timed out after {timeouts.get(name, default_timeout)}s")
+            yield name, None, {
+                'status': 'timeout',
+                'latency_ms': round((now - started) * 1000, 1)
+            }
+
+
+def fan_out(tasks, timeouts, default_timeout=5.0, inline=()):
+    """Run ``tasks`` concurrently and wait for all of them (or their deadlines).
+
+    Returns ``(results, sources)``. ``results`` only holds the sources that
+    finished in time, ``sources`` has a status/latency entry for every task.
+    """
+    results = {}
+    sources = {}
+    for name, result, source in iter_fan_out(tasks, timeouts, default_timeout, inline):
+        sources[name] = source
+        if source['status'] == 'ok':
+            results[name] = result
+    return results, sources
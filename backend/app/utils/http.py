@@ -0,0 +1,161 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from flask import current_app
+
+# Responses worth retrying: rate limited or a temporarily unavailable upstream
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_METHODS = {'GET', 'HEAD'}
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class HTTPClient:
+    """Pooled keep-alive HTTP client shared by the external API services.
+
+    Wraps a single ``requests.Session`` so connections to the same host are
+    reused, applies default connect/read timeouts, and retries idempotent
+    requests on connection errors and retryable statuses with capped,
+    jittered exponential backoff.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, connect_timeout=3.05,
+                 read_timeout=10, max_retries=2, backoff_factor=0.5, backoff_max=8):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def request(self, method, url, deadline=None, **kwargs):
+        """Send a request, retrying where that is safe.
+
+        ``deadline`` is a ``time.monotonic()`` value the caller stops waiting
+        at: every attempt's timeouts are cut to the time left before it, and
+        no retry is started that its backoff would push past it.
+        """
+        timeout = kwargs.pop('timeout', self.timeout)
+        retries = self.max_retries if method.upper() in RETRY_METHODS else 0
+        parts = urlsplit(url)
+
+        attempt = 0
+        while True:
+            kwargs['timeout'] = timeout if deadline is None else self._within(timeout, deadline)
+            delay = self._backoff(attempt + 1)
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(parts, time.monotonic() - started, failed=True)
+                if attempt >= retries or self._past(deadline, delay):
+                    raise
+            else:
+                retryable = response.status_code in RETRY_STATUSES
+                self._record(parts, time.monotonic() - started, failed=retryable)
+                if not retryable or attempt >= retries or self._past(deadline, delay):
+                    return response
+                retry_after = response.headers.get('Retry-After')
+                if retry_after and retry_after.isdigit() and int(retry_after) > self.backoff_max:
+                    # Waiting that long would hold the worker, let the caller decide
+                    return response
+                response.close()
+
+            attempt += 1
+            self._record_retry(parts)
+            time.sleep(delay)
+
+    @staticmethod
+    def _within(timeout, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout("Deadline passed before the request was sent")
+        if isinstance(timeout, tuple):
+            return tuple(min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
+
+    @staticmethod
+    def _past(deadline, delay):
+        # Whether a retry after ``delay`` would only start once the caller has given up
+        return deadline is not None and time.monotonic() + delay >= deadline
+
+    def _backoff(self, attempt):
+        # "Full jitter": a random delay up to the capped exponential backoff
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+
+    def _host_stats(self, parts):
+        host = parts.hostname
+        if host not in self._stats:
+            self._stats[host] = {
+                'scheme': parts.scheme,
+                'port': parts.port,
+                'requests': 0,
+                'failures': 0,
+                'retries': 0,
+                'total_latency': 0.0
+            }
+        return self._stats[host]
+
+    def _record(self, parts, latency, failed=False):
+        with self._lock:
+            stats = self._host_stats(parts)
+            stats['requests'] += 1
+            stats['total_latency'] += latency
+            if failed:
+                stats['failures'] += 1
+
+    def _record_retry(self, parts):
+        with self._lock:
+            self._host_stats(parts)['retries'] += 1
+
+    def stats(self):
+        """Per-host request counters plus connection pool usage."""
+        with self._lock:
+            snapshot = {host: dict(stats) for host, stats in self._stats.items()}
+
+        result = {}
+        for host, stats in snapshot.items():
+            scheme = stats.pop('scheme')
+            port = stats.pop('port')
+            total_latency = stats.pop('total_latency')
+            stats['avg_latency_ms'] = round(total_latency / stats['requests'] * 1000, 1) if stats['requests'] else 0.0
+
+            # A connections count well below the request count means keep-alive works
+            adapter = self.session.get_adapter(f'{scheme}://{host}')
+            pool = adapter.poolmanager.connection_from_host(host, port=port, scheme=scheme)
+            stats['connections_opened'] = pool.num_connections
+            stats['pool_requests'] = pool.num_requests
+            result[host] = stats
+        return result
+
+
+def get_http_client():
+    """Process-wide HTTPClient configured from the current app's config."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                config = current_app.config
+                _client = HTTPClient(
+                    pool_connections=config.get('HTTP_POOL_CONNECTIONS', 10),
+                    pool_maxsize=config.get('HTTP_POOL_MAXSIZE', 10),
+                    connect_timeout=config.get('HTTP_CONNECT_TIMEOUT', 3.05),
+                    read_timeout=config.get('HTTP_READ_TIMEOUT', 10),
+                    max_retries=config.get('HTTP_MAX_RETRIES', 2),
+                    backoff_factor=config.get('HTTP_BACKOFF_FACTOR', 0.5),
+                    backoff_max=config.get('HTTP_BACKOFF_MAX', 8)
+                )
+    return _client
@@ -0,0 +1,79 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+from flask import Response, current_app, request
+from sqlalchemy import func
+from werkzeug.http import is_resource_modified
+from app.extensions import db
+
+
+class CatalogVersion:
+    """Cheap validator for a table: row count, highest id and latest ``updated_at``.
+
+    The three only ever move together with the table's contents, and being
+    read from the database they agree across worker processes. One aggregate
+    query computes them; the result is kept until a committed write calls
+    ``invalidate`` or, for writes from other processes, ``CATALOG_VERSION_TTL``
+    runs out.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._version = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Return the version token for the table as it is now."""
+        ttl = current_app.config.get('CATALOG_VERSION_TTL', 5)
+        with self._lock:
+            if self._version is not None and time.monotonic() - self._loaded_at <= ttl:
+                return self._version
+
+        loaded_at = time.monotonic()
+        count, max_id, updated_at = db.session.query(
+            func.count(self.model.id), func.max(self.model.id), func.max(self.model.updated_at)
+        ).one()
+        version = f"{count}:{max_id}:{updated_at.isoformat() if updated_at else ''}"
+        with self._lock:
+            # An invalidate() that ran while we were querying wins
+            if loaded_at >= self._loaded_at:
+                self._version = version
+                self._loaded_at = loaded_at
+        return version
+
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+            self._loaded_at = time.monotonic()
+
+
+def conditional_get(version):
+    """Answer GETs with validators from ``version``, a CatalogVersion.
+
+    The ETag covers the version and the full request path, so each page and
+    filter gets its own, and a matching If-None-Match gets a bodiless 304
+    before the view runs. There is no Last-Modified: the newest
+    ``updated_at`` doesn't move when a row is deleted, so If-Modified-Since
+    could revalidate a stale listing.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            etag = hashlib.sha1(f"{version.current()}|{request.full_path}".encode()).hexdigest()
+
+            if not is_resource_modified(request.environ, etag=etag):
+                response = Response(status=304)
+            else:
+                response = current_app.make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.cache_control.public = True
+            response.cache_control.max_age = current_app.config.get('CATALOG_MAX_AGE', 0)
+            response.cache_control.must_revalidate = True
+            return response
+        return wrapper
+    return decorator
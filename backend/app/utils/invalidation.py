@@ -0,0 +1,46 @@
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+from app.extensions import db
+
+# session.info key holding {registration: [records]} until commit or rollback
+PENDING_KEY = 'pending_invalidations'
+
+_callbacks = {}
+
+
+def on_commit_after_change(model, callback, record=None):
+    """Call ``callback(records)`` after each commit that inserted, updated or deleted ``model`` rows.
+
+    ``record(target, operation)`` runs as each row is flushed, while the
+    instance still holds what was written (``operation`` is 'insert',
+    'update' or 'delete'). Its results reach ``callback`` in flush order once
+    the transaction has committed, so caches are never cleared for writes
+    that get rolled back. Without ``record`` the callback gets the operations.
+
+    Registering the same ``(model, callback)`` again is a no-op, so this can
+    run from the app factory.
+    """
+    key = (model, callback)
+    if key in _callbacks:
+        return
+    _callbacks[key] = callback
+
+    def collect(operation):
+        def listener(mapper, connection, target):
+            pending = object_session(target).info.setdefault(PENDING_KEY, {})
+            pending.setdefault(key, []).append(record(target, operation) if record else operation)
+        return listener
+
+    for operation in ('insert', 'update', 'delete'):
+        event.listen(model, f'after_{operation}', collect(operation))
+
+
+@event.listens_for(db.session, 'after_commit')
+def _run_callbacks(session):
+    for key, records in session.info.pop(PENDING_KEY, {}).items():
+        _callbacks[key](records)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_changes(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,91 @@
+import base64
+import json
+import math
+import threading
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import tuple_
+from app.utils.cache import TTLCache
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, row_id):
+    """Opaque cursor pointing just past the row with this ``(created_at, id)``."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(created_at, id)`` from a cursor, raise InvalidCursor if it isn't one of ours."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_page(query, model, cursor, per_page):
+    """Fetch the page after ``cursor`` (the first page when empty), newest first.
+
+    Rows are ordered by ``(created_at, id)`` descending and the page starts
+    with a comparison on that pair instead of an OFFSET, so the database
+    seeks straight into the created_at index however deep the page is.
+    Returns ``(items, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    per_page = max(per_page, 1)
+    if cursor:
+        query = query.filter(tuple_(model.created_at, model.id) < decode_cursor(cursor))
+    # One extra row tells whether there is a next page without counting
+    items = query.order_by(model.created_at.desc(), model.id.desc()).limit(per_page + 1).all()
+    if len(items) <= per_page:
+        return items, None
+    items = items[:per_page]
+    return items, encode_cursor(items[-1].created_at, items[-1].id)
+
+
+def page_count(total, per_page):
+    return math.ceil(total / per_page) if total and per_page > 0 else 0
+
+
+class CountCache:
+    """Row counts for paginated listings, cached until a write invalidates them.
+
+    Counts are grouped in scopes (e.g. one per user for bookmarks). ``invalidate``
+    bumps the scope's generation instead of deleting keys, so a count that
+    was being loaded while the write committed lands under the old generation
+    and is never served. The TTL only bounds how long a missed invalidation
+    (a write from another process) can show.
+    """
+
+    def __init__(self):
+        self.cache = None
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def _init_cache(self):
+        if self.cache is None:
+            with self._lock:
+                if self.cache is None:
+                    self.cache = TTLCache(
+                        maxsize=current_app.config.get('COUNT_CACHE_MAX_ENTRIES', 10000),
+                        ttl=current_app.config.get('COUNT_CACHE_TTL', 300)
+                    )
+        return self.cache
+
+    def count(self, scope, key, query):
+        """Return ``query.count()``, cached under ``key`` within ``scope``."""
+        cache = self._init_cache()
+        with self._lock:
+            generation = self._generations.get(scope, 0)
+        return cache.get_or_load((scope, generation, key), lambda: query.order_by(None).count())
+
+    def invalidate(self, scope):
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def stats(self):
+        return self.cache.stats() if self.cache else None
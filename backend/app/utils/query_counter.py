@@ -0,0 +1,29 @@
+import threading
+from contextlib import contextmanager
+from sqlalchemy import event
+
+_local = threading.local()
+
+
+def _count(conn, cursor, statement, parameters, context, executemany):
+    counter = getattr(_local, 'counter', None)
+    if counter is not None:
+        counter.append((statement, parameters))
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SQL statements ``engine`` runs in this thread inside the block.
+
+    Yields a list that fills up with ``(statement, parameters)`` pairs,
+    ``len()`` is the query count.
+    """
+    statements = []
+    previous = getattr(_local, 'counter', None)
+    _local.counter = statements
+    event.listen(engine, 'before_cursor_execute', _count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', _count)
+        _local.counter = previous
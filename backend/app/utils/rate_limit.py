@@ -0,0 +1,119 @@
+import threading
+import time
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call would exceed the upstream quota within the allowed wait."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """Token bucket that follows an upstream API's X-RateLimit-* headers.
+
+    Tokens refill at ``limit / window`` per second up to ``limit``. After each
+    response, ``update_from_headers`` pulls the bucket down to what the
+    server says is left, so several workers sharing one quota stay in line.
+    ``acquire`` queues a caller for at most ``max_wait`` seconds and sheds it
+    with RateLimitExceeded when no token would be available by then.
+    """
+
+    def __init__(self, limit, window=60, reserve=0, max_wait=0):
+        self.limit = limit
+        self.window = window
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.tokens = float(max(limit - reserve, 0))
+        self.updated = time.monotonic()
+
+        # Last values reported by the server
+        self.remaining = None
+        self.reset_at = None
+
+        self._cond = threading.Condition()
+        self._stats = {'allowed': 0, 'queued': 0, 'shed': 0}
+
+    @property
+    def rate(self):
+        return self.limit / float(self.window)
+
+    def _refill(self, now):
+        capacity = max(self.limit - self.reserve, 0)
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _wait_time(self):
+        """Seconds until a call may go out, 0 if it may go out now."""
+        if self.remaining is not None and self.remaining <= self.reserve and self.reset_at:
+            quota_wait = self.reset_at - time.time()
+            if quota_wait > 0:
+                return quota_wait
+            # The window has reset, forget the exhausted count
+            self.remaining = None
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def acquire(self, max_wait=None):
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        queued = False
+
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_time()
+                if wait == 0:
+                    self.tokens -= 1
+                    if self.remaining is not None:
+                        self.remaining -= 1
+                    self._stats['allowed'] += 1
+                    return
+                if now + wait > deadline:
+                    self._stats['shed'] += 1
+                    raise RateLimitExceeded(
+                        f"Rate limit budget exhausted, retry in {wait:.0f}s", retry_after=wait
+                    )
+                if not queued:
+                    queued = True
+                    self._stats['queued'] += 1
+                self._cond.wait(wait)
+
+    def update_from_headers(self, headers):
+        try:
+            limit = int(headers['X-RateLimit-Limit'])
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset_at = int(headers['X-RateLimit-Reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self._cond:
+            self.limit = limit
+            self.remaining = remaining
+            self.reset_at = reset_at
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, max(remaining - self.reserve, 0))
+            self._cond.notify_all()
+
+    def mark_exhausted(self, reset_at=None):
+        """Stop issuing calls until ``reset_at`` (epoch seconds), e.g. after a 403/429."""
+        with self._cond:
+            self.remaining = 0
+            self.reset_at = reset_at or time.time() + self.window
+            self.tokens = 0
+
+    def budget(self):
+        with self._cond:
+            self._refill(time.monotonic())
+            budget = {
+                'limit': self.limit,
+                'remaining': self.remaining,
+                'tokens': round(self.tokens, 2),
+                'reset_in': max(round(self.reset_at - time.time()), 0) if self.reset_at else None,
+                'wait': round(self._wait_time(), 2)
+            }
+            budget.update(self._stats)
+        return budget
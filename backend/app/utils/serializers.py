@@ -0,0 +1,97 @@
+import orjson
+from flask import current_app
+from sqlalchemy.orm import joinedload
+from app.models import Bookmark, Resource, User
+
+
+class Serializer:
+    """Turns model rows into JSON dicts and declares the relationships that needs.
+
+    ``apply`` adds the matching loader options to a query, so the related
+    rows come back with the page instead of one lazy load per item.
+    """
+
+    def __init__(self, options, dump):
+        # Built on demand: backref attributes only exist once the mappers are configured
+        self._options = options
+        self._dump = dump
+
+    def options(self):
+        return self._options()
+
+    def apply(self, query):
+        return query.options(*self.options())
+
+    def dump(self, item):
+        return self._dump(item)
+
+    def dump_many(self, items):
+        return [self._dump(item) for item in items]
+
+
+# Resource.to_dict reads submitter.username
+resource_serializer = Serializer(
+    lambda: (joinedload(Resource.submitter),),
+    Resource.to_dict
+)
+
+# Bookmark.to_dict reads resource.to_dict, which reads resource.submitter
+bookmark_serializer = Serializer(
+    lambda: (joinedload(Bookmark.resource).joinedload(Resource.submitter),),
+    Bookmark.to_dict
+)
+
+
+class RowSerializer:
+    """Read-path counterpart of Serializer that never builds ORM objects.
+
+    ``project`` narrows a query to plain column tuples, with related columns
+    joined into the same SELECT, and ``dump`` turns one such row into the
+    dict the model's ``to_dict`` would give. Rows keep their column names as
+    attributes, so keyset pagination works on them as on model instances.
+    """
+
+    def __init__(self, project, dump):
+        self._project = project
+        self._dump = dump
+
+    def project(self, query):
+        return self._project(query)
+
+    def dump(self, row):
+        return self._dump(row)
+
+    def dump_many(self, rows):
+        return [self._dump(row) for row in rows]
+
+
+def _project_resources(query):
+    return query.with_entities(
+        Resource.id, Resource.title, Resource.description, Resource.url, Resource.category,
+        Resource.is_approved, Resource.created_at, Resource.updated_at,
+        User.username.label('submitter')
+    ).outerjoin(User, User.id == Resource.submitter_id)
+
+
+def _dump_resource_row(row):
+    id, title, description, url, category, is_approved, created_at, updated_at, submitter = row
+    return {
+        'id': id,
+        'title': title,
+        'description': description,
+        'url': url,
+        'category': category,
+        'is_approved': is_approved,
+        'created_at': created_at.isoformat(),
+        'updated_at': updated_at.isoformat(),
+        'submitter': submitter
+    }
+
+
+# Same output as Resource.to_dict, for listings that only read
+resource_rows = RowSerializer(_project_resources, _dump_resource_row)
+
+
+def json_response(payload, status=200):
+    """jsonify() for hot read paths: encoded by orjson straight to bytes, keys unsorted."""
+    return current_app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
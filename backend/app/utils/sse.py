@@ -0,0 +1,13 @@
+import json
+
+
+def format_sse(event, payload):
+    """Encode one Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+def streaming_headers(response):
+    """Keep browsers and proxies from caching or buffering a streamed response."""
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,5 @@
+def estimate_tokens(text):
+    """Rough token count for English text (about 4 characters per token)."""
+    if not text:
+        return 0
+    return max(1, (len(text) + 3) // 4)
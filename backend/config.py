@@ -22,6 +22,100 @@ class Config:
     GITHUB_API_TOKEN = os.getenv('GITHUB_API_TOKEN')
     GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
     
+    # Outbound HTTP to external APIs, timeouts and backoff in seconds
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 10))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 10))
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 2))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', 0.5))
+    HTTP_BACKOFF_MAX = float(os.getenv('HTTP_BACKOFF_MAX', 8))
+    
+    # GitHub search quota (requests per minute) used until the first response
+    # headers report the real one. Calls wait at most GITHUB_RATE_LIMIT_MAX_WAIT
+    # seconds for budget and are shed after that.
+    GITHUB_SEARCH_RATE_LIMIT = int(os.getenv('GITHUB_SEARCH_RATE_LIMIT', 10))
+    GITHUB_SEARCH_RATE_LIMIT_AUTHENTICATED = int(os.getenv('GITHUB_SEARCH_RATE_LIMIT_AUTHENTICATED', 30))
+    GITHUB_RATE_LIMIT_RESERVE = int(os.getenv('GITHUB_RATE_LIMIT_RESERVE', 1))
+    GITHUB_RATE_LIMIT_MAX_WAIT = float(os.getenv('GITHUB_RATE_LIMIT_MAX_WAIT', 2.0))
+    
+    # Search fan-out (/api/search/all), timeouts in seconds per upstream source
+    SEARCH_FANOUT_WORKERS = int(os.getenv('SEARCH_FANOUT_WORKERS', 8))
+    SEARCH_GITHUB_TIMEOUT = float(os.getenv('SEARCH_GITHUB_TIMEOUT', 4.0))
+    SEARCH_ARXIV_TIMEOUT = float(os.getenv('SEARCH_ARXIV_TIMEOUT', 4.0))
+    
+    # External search result cache, TTLs in seconds. Expired entries are
+    # still served for SEARCH_CACHE_STALE_TTL while they are refreshed.
+    SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', 512))
+    GITHUB_CACHE_TTL = int(os.getenv('GITHUB_CACHE_TTL', 300))
+    ARXIV_CACHE_TTL = int(os.getenv('ARXIV_CACHE_TTL', 900))
+    SEARCH_CACHE_STALE_TTL = int(os.getenv('SEARCH_CACHE_STALE_TTL', 600))
+    
+    # /api/search/all answers GitHub/arXiv from the local mirror when it has at
+    # least this many hits fetched within MIRROR_MAX_AGE seconds, 0 always goes
+    # live. The choice is kept per query for MIRROR_DECISION_TTL seconds so
+    # paging through one query stays on the same side.
+    MIRROR_MIN_RESULTS = int(os.getenv('MIRROR_MIN_RESULTS', 5))
+    MIRROR_MAX_AGE = int(os.getenv('MIRROR_MAX_AGE', 86400))
+    MIRROR_DECISION_TTL = int(os.getenv('MIRROR_DECISION_TTL', 600))
+    MIRROR_DECISION_CACHE_SIZE = int(os.getenv('MIRROR_DECISION_CACHE_SIZE', 1000))
+    
+    # Semantic search over approved resources (/api/search/semantic and the
+    # chat retriever): hashed TF-IDF vector size and minimum cosine score
+    SEMANTIC_INDEX_DIM = int(os.getenv('SEMANTIC_INDEX_DIM', 256))
+    SEMANTIC_MIN_SCORE = float(os.getenv('SEMANTIC_MIN_SCORE', 0.1))
+    
+    # Trending repositories/papers are refreshed in the background, 0 disables
+    # the scheduler and computes them on first request instead (retried after
+    # TRENDING_RETRY_BACKOFF seconds while both sources fail)
+    TRENDING_REFRESH_INTERVAL = int(os.getenv('TRENDING_REFRESH_INTERVAL', 900))
+    TRENDING_RETRY_BACKOFF = int(os.getenv('TRENDING_RETRY_BACKOFF', 60))
+    TRENDING_SNAPSHOT_PATH = os.getenv('TRENDING_SNAPSHOT_PATH', os.path.join(basedir, 'instance', 'trending_snapshot.json'))
+    
+    # AI chat: conversation history sent to the model is trimmed to this many
+    # (estimated) tokens, older turns are reduced to a short topic list
+    CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv('CHAT_HISTORY_TOKEN_BUDGET', 4000))
+    CHAT_HISTORY_SUMMARY_TOKENS = int(os.getenv('CHAT_HISTORY_SUMMARY_TOKENS', 200))
+    
+    # Server-side chat sessions: idle sessions expire after CHAT_SESSION_TTL_DAYS,
+    # each user keeps at most CHAT_SESSIONS_PER_USER (oldest evicted first) and
+    # each session at most CHAT_SESSION_MAX_TURNS messages
+    CHAT_SESSION_TTL_DAYS = int(os.getenv('CHAT_SESSION_TTL_DAYS', 30))
+    CHAT_SESSIONS_PER_USER = int(os.getenv('CHAT_SESSIONS_PER_USER', 20))
+    CHAT_SESSION_MAX_TURNS = int(os.getenv('CHAT_SESSION_MAX_TURNS', 200))
+    # Most recent turns loaded as model history (then trimmed to the token budget)
+    CHAT_SESSION_HISTORY_TURNS = int(os.getenv('CHAT_SESSION_HISTORY_TURNS', 40))
+    
+    # Prompt context: resource snippets are packed into these (estimated) token
+    # budgets, descriptions are cut to CONTEXT_SNIPPET_MAX_WORDS
+    CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv('CHAT_CONTEXT_TOKEN_BUDGET', 1500))
+    RECOMMENDATION_CONTEXT_TOKEN_BUDGET = int(os.getenv('RECOMMENDATION_CONTEXT_TOKEN_BUDGET', 3000))
+    CONTEXT_SNIPPET_MAX_WORDS = int(os.getenv('CONTEXT_SNIPPET_MAX_WORDS', 80))
+    CONTEXT_SNIPPET_CACHE_SIZE = int(os.getenv('CONTEXT_SNIPPET_CACHE_SIZE', 5000))
+    
+    # /api/chat/query answer cache, TTL in seconds
+    CHAT_ANSWER_CACHE_TTL = int(os.getenv('CHAT_ANSWER_CACHE_TTL', 3600))
+    CHAT_ANSWER_CACHE_MAX_ENTRIES = int(os.getenv('CHAT_ANSWER_CACHE_MAX_ENTRIES', 1000))
+    
+    # LLM backend: 'gemini', or 'local' for a deterministic offline model with
+    # simulated latency (seconds before the first token) and token rate
+    LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'gemini')
+    LLM_MODEL = os.getenv('LLM_MODEL', 'gemini-2.0-flash')
+    LOCAL_LLM_LATENCY = float(os.getenv('LOCAL_LLM_LATENCY', 0.5))
+    LOCAL_LLM_TOKENS_PER_SECOND = float(os.getenv('LOCAL_LLM_TOKENS_PER_SECOND', 50))
+    LOCAL_LLM_REPLY_TOKENS = int(os.getenv('LOCAL_LLM_REPLY_TOKENS', 120))
+    
+    # LLM bulkhead: at most LLM_MAX_CONCURRENT Gemini calls in flight, up to
+    # LLM_MAX_QUEUE more wait LLM_QUEUE_TIMEOUT seconds, the rest get a 503
+    LLM_MAX_CONCURRENT = int(os.getenv('LLM_MAX_CONCURRENT', 4))
+    LLM_MAX_QUEUE = int(os.getenv('LLM_MAX_QUEUE', 16))
+    LLM_QUEUE_TIMEOUT = float(os.getenv('LLM_QUEUE_TIMEOUT', 10))
+    
+    # Per-user recommendations are recomputed in the background when bookmarks
+    # change, by this many workers with at most RECOMMENDATION_MAX_PENDING queued
+    RECOMMENDATION_WORKERS = int(os.getenv('RECOMMENDATION_WORKERS', 2))
+    RECOMMENDATION_MAX_PENDING = int(os.getenv('RECOMMENDATION_MAX_PENDING', 100))
+    
     # CORS
     CORS_ORIGINS = ["http://localhost:3000"]
     CORS_METHODS = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
@@ -30,8 +124,18 @@ class Config:
     CORS_SUPPORTS_CREDENTIALS = True
     CORS_MAX_AGE = 3600
     
+    # Conditional GET for the resource catalog: the version behind its ETags is
+    # re-read after CATALOG_VERSION_TTL seconds (sooner after a local write), and
+    # clients may reuse a response for CATALOG_MAX_AGE seconds before revalidating
+    CATALOG_VERSION_TTL = float(os.getenv('CATALOG_VERSION_TTL', 5))
+    CATALOG_MAX_AGE = int(os.getenv('CATALOG_MAX_AGE', 0))
+    
     # Pagination
     ITEMS_PER_PAGE = 20
+    # Listing totals are cached until a write to the table, COUNT_CACHE_TTL bounds
+    # how long writes from another process can go unseen
+    COUNT_CACHE_TTL = int(os.getenv('COUNT_CACHE_TTL', 300))
+    COUNT_CACHE_MAX_ENTRIES = int(os.getenv('COUNT_CACHE_MAX_ENTRIES', 10000))
     
     def __init__(self):
         if not self.GOOGLE_API_KEY:
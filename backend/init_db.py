@@ -1,6 +1,7 @@
 import os
 from app import create_app
 from app.extensions import db
+from app.services.search_service import SearchService
 
 def init_database():
     # Create instance directory if it doesn't exist
@@ -15,6 +16,10 @@ def init_database():
         db.create_all()
         print("Database tables created successfully!")
         
+        # Full-text search index (SQLite only, other databases use ilike)
+        if SearchService().ensure_index():
+            print("Full-text search index created successfully!")
+        
         # Check if database file exists
         db_path = os.path.join(instance_path, 'ai_learning_hub.db')
         if os.path.exists(db_path):
@@ -1,3 +1,4 @@
+import fnmatch
 import logging
 from logging.config import fileConfig
 
@@ -51,6 +52,14 @@ def get_metadata():
     return target_db.metadata
 
 
+# SQLite FTS5 tables (and their shadow tables) are created with raw SQL in
+# migrations, there is nothing in the models for autogenerate to compare them to
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == 'table' and fnmatch.fnmatch(name, '*_fts*'):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +74,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +103,8 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
@@ -0,0 +1,38 @@
+"""Add stars to external_item so GitHub mirror hits can be ordered like live results
+
+Revision ID: a4e9d2b6c813
+Revises: f2c6a8d41e73
+Create Date: 2026-10-18 21:05:17.642309
+
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4e9d2b6c813'
+down_revision = 'f2c6a8d41e73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('external_item', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('stars', sa.Integer(), nullable=True))
+
+    # Backfill from the stored item, where the count has been all along
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT id, data FROM external_item WHERE source = 'github'")).fetchall()
+    for item_id, data in rows:
+        stars = json.loads(data).get('stars')
+        if stars is not None:
+            connection.execute(
+                sa.text("UPDATE external_item SET stars = :stars WHERE id = :id"),
+                {'stars': stars, 'id': item_id}
+            )
+
+
+def downgrade():
+    with op.batch_alter_table('external_item', schema=None) as batch_op:
+        batch_op.drop_column('stars')
@@ -0,0 +1,62 @@
+"""Add FTS5 full-text index over resource title, description and category
+
+Revision ID: b7d4e2a91c05
+Revises: 6983b67acb4f
+Create Date: 2026-10-18 10:12:31.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d4e2a91c05'
+down_revision = '6983b67acb4f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite only, other databases keep using the ilike fallback
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("""
+        CREATE VIRTUAL TABLE resource_fts USING fts5(
+            title, description, category,
+            content='resource', content_rowid='id',
+            tokenize='porter unicode61'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER resource_fts_ai AFTER INSERT ON resource BEGIN
+            INSERT INTO resource_fts(rowid, title, description, category)
+            VALUES (new.id, new.title, new.description, new.category);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER resource_fts_ad AFTER DELETE ON resource BEGIN
+            INSERT INTO resource_fts(resource_fts, rowid, title, description, category)
+            VALUES ('delete', old.id, old.title, old.description, old.category);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER resource_fts_au AFTER UPDATE ON resource BEGIN
+            INSERT INTO resource_fts(resource_fts, rowid, title, description, category)
+            VALUES ('delete', old.id, old.title, old.description, old.category);
+            INSERT INTO resource_fts(rowid, title, description, category)
+            VALUES (new.id, new.title, new.description, new.category);
+        END
+    """)
+    # Index the rows that already exist
+    op.execute("INSERT INTO resource_fts(resource_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS resource_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS resource_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS resource_fts_ai")
+    op.execute("DROP TABLE IF EXISTS resource_fts")
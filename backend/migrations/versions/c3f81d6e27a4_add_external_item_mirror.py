@@ -0,0 +1,74 @@
+"""Add external_item mirror of GitHub and arXiv results with FTS5 index
+
+Revision ID: c3f81d6e27a4
+Revises: b7d4e2a91c05
+Create Date: 2026-10-18 14:41:07.318245
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f81d6e27a4'
+down_revision = 'b7d4e2a91c05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('external_item',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('external_id', sa.String(length=200), nullable=False),
+    sa.Column('title', sa.String(length=500), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('url', sa.String(length=500), nullable=True),
+    sa.Column('published_at', sa.DateTime(), nullable=True),
+    sa.Column('data', sa.Text(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'external_id', name='uq_external_item_source_external_id')
+    )
+
+    # FTS5 is SQLite only, other databases search the mirror with ilike
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("""
+        CREATE VIRTUAL TABLE external_item_fts USING fts5(
+            title, description,
+            content='external_item', content_rowid='id',
+            tokenize='porter unicode61'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER external_item_fts_ai AFTER INSERT ON external_item BEGIN
+            INSERT INTO external_item_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER external_item_fts_ad AFTER DELETE ON external_item BEGIN
+            INSERT INTO external_item_fts(external_item_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER external_item_fts_au AFTER UPDATE ON external_item BEGIN
+            INSERT INTO external_item_fts(external_item_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO external_item_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS external_item_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS external_item_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS external_item_fts_ai")
+        op.execute("DROP TABLE IF EXISTS external_item_fts")
+
+    op.drop_table('external_item')
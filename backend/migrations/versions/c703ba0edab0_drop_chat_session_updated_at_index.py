@@ -0,0 +1,26 @@
+"""Drop the single-column chat_session updated_at index, (user_id, updated_at) covers the lookups
+
+Revision ID: c703ba0edab0
+Revises: a4e9d2b6c813
+Create Date: 2026-10-18 21:40:11.382907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c703ba0edab0'
+down_revision = 'a4e9d2b6c813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chat_session', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_chat_session_updated_at'))
+
+
+def downgrade():
+    with op.batch_alter_table('chat_session', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_chat_session_updated_at'), ['updated_at'], unique=False)
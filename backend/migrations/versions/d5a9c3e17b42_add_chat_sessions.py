@@ -0,0 +1,56 @@
+"""Add chat_session and chat_turn tables for server-side conversations
+
+Revision ID: d5a9c3e17b42
+Revises: c3f81d6e27a4
+Create Date: 2026-10-18 16:02:51.774310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a9c3e17b42'
+down_revision = 'c3f81d6e27a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chat_session',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=True),
+    sa.Column('turn_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('chat_session', schema=None) as batch_op:
+        batch_op.create_index('ix_chat_session_user_id_updated_at', ['user_id', 'updated_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_chat_session_updated_at'), ['updated_at'], unique=False)
+
+    op.create_table('chat_turn',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(length=10), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('session_id', sa.String(length=32), nullable=False),
+    sa.ForeignKeyConstraint(['session_id'], ['chat_session.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('chat_turn', schema=None) as batch_op:
+        batch_op.create_index('ix_chat_turn_session_id_id', ['session_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('chat_turn', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_turn_session_id_id')
+
+    op.drop_table('chat_turn')
+    with op.batch_alter_table('chat_session', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_chat_session_updated_at'))
+        batch_op.drop_index('ix_chat_session_user_id_updated_at')
+
+    op.drop_table('chat_session')
@@ -0,0 +1,31 @@
+"""Add user_recommendation table for precomputed recommendations
+
+Revision ID: e8b1f47c2d90
+Revises: d5a9c3e17b42
+Create Date: 2026-10-18 17:48:12.092655
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b1f47c2d90'
+down_revision = 'd5a9c3e17b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_recommendation',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('fingerprint', sa.String(length=40), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('user_recommendation')
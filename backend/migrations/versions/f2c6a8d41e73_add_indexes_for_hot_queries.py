@@ -0,0 +1,45 @@
+"""Add composite indexes for resource/bookmark listings and unique bookmarks
+
+Revision ID: f2c6a8d41e73
+Revises: e8b1f47c2d90
+Create Date: 2026-10-18 19:12:40.551834
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a8d41e73'
+down_revision = 'e8b1f47c2d90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the oldest of any duplicate bookmarks so the unique constraint can be added
+    op.execute("""
+        DELETE FROM bookmark WHERE id NOT IN (
+            SELECT MIN(id) FROM bookmark GROUP BY user_id, resource_id
+        )
+    """)
+
+    with op.batch_alter_table('bookmark', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_bookmark_user_id_resource_id', ['user_id', 'resource_id'])
+        batch_op.create_index('ix_bookmark_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('resource', schema=None) as batch_op:
+        batch_op.create_index('ix_resource_is_approved_created_at', ['is_approved', 'created_at'], unique=False)
+        batch_op.create_index('ix_resource_is_approved_category_created_at', ['is_approved', 'category', 'created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_resource_url'), ['url'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resource', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resource_url'))
+        batch_op.drop_index('ix_resource_is_approved_category_created_at')
+        batch_op.drop_index('ix_resource_is_approved_created_at')
+
+    with op.batch_alter_table('bookmark', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookmark_user_id_created_at')
+        batch_op.drop_constraint('uq_bookmark_user_id_resource_id', type_='unique')
@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.arxiv_service import iter_atom_entries
+
+ENTRY = """  <entry>
+    <id>http://arxiv.org/abs/2401.{n:05d}v1</id>
+    <updated>2024-01-01T00:00:00Z</updated>
+    <published>2024-01-01T00:00:00Z</published>
+    <title>Paper number {n} about learning representations</title>
+    <summary>{summary}</summary>
+    <author><name>Author One</name></author>
+    <author><name>Author Two</name></author>
+    <author><name>Author Three</name></author>
+    <link href="http://arxiv.org/abs/2401.{n:05d}v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.{n:05d}v1" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+"""
+
+SUMMARY = " ".join(["We study a model that learns useful representations from data."] * 20)
+
+
+def feed_chunks(entries, chunk_size=16 * 1024):
+    """Generate a synthetic arXiv feed in chunks, like response.iter_content()."""
+    buffer = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" '
+        'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+        'xmlns:arxiv="http://arxiv.org/schemas/atom">\n'
+        f'  <opensearch:totalResults>{entries}</opensearch:totalResults>\n'
+    )
+    for n in range(entries):
+        buffer += ENTRY.format(n=n, summary=SUMMARY)
+        if len(buffer) >= chunk_size:
+            yield buffer.encode()
+            buffer = ''
+    yield (buffer + '</feed>\n').encode()
+
+
+def parse_buffered(entries):
+    """The previous approach: buffer the body, build the tree, find() per field."""
+    content = b''.join(feed_chunks(entries))
+    root = ET.fromstring(content)
+    namespace = {'atom': 'http://www.w3.org/2005/Atom'}
+    items = []
+    for entry in root.findall('.//atom:entry', namespace):
+        items.append({
+            'id': entry.find('atom:id', namespace).text,
+            'title': entry.find('atom:title', namespace).text,
+            'summary': entry.find('atom:summary', namespace).text,
+            'url': entry.find('atom:link', namespace).get('href'),
+            'published': entry.find('atom:published', namespace).text,
+            'authors': [author.text for author in entry.findall('.//atom:name', namespace)]
+        })
+    return items
+
+
+def parse_streaming(entries):
+    return list(iter_atom_entries(feed_chunks(entries)))
+
+
+def measure(func, entries, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(entries)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    func(entries)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    for entries in (10, 100, 1000, 2000):
+        assert parse_buffered(entries) == parse_streaming(entries)
+        old_time, old_peak = measure(parse_buffered, entries)
+        new_time, new_peak = measure(parse_streaming, entries)
+        print(
+            f"{entries:5d} entries | "
+            f"buffered {old_time * 1000:8.2f} ms {old_peak / 1024:9.1f} KiB | "
+            f"streaming {new_time * 1000:8.2f} ms {new_peak / 1024:9.1f} KiB"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Offline model and no background jobs, unless overridden from the environment
+os.environ.setdefault('LLM_PROVIDER', 'local')
+os.environ.setdefault('TRENDING_REFRESH_INTERVAL', '0')
+
+from flask_jwt_extended import create_access_token
+from app import create_app
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def run_client(app, headers, endpoint, requests_per_client, results):
+    client = app.test_client()
+    for i in range(requests_per_client):
+        body = {'message': f"What is gradient descent? ({i})", 'conversation_history': []}
+        started = time.perf_counter()
+        if endpoint == 'stream':
+            response = client.post('/api/chat/stream', json=body, headers=headers, buffered=False)
+            first_chunk_at = None
+            for _ in response.response:
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter()
+            response.close()
+        else:
+            response = client.post('/api/chat/', json=body, headers=headers)
+            first_chunk_at = None
+        results.append({
+            'status': response.status_code,
+            'latency': time.perf_counter() - started,
+            'ttft': first_chunk_at - started if first_chunk_at else None
+        })
+
+
+def benchmark(clients, requests_per_client, endpoint):
+    app = create_app()
+    with app.app_context():
+        headers = {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+
+    results = []
+    threads = [
+        threading.Thread(target=run_client, args=(app, headers, endpoint, requests_per_client, results))
+        for _ in range(clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ok = [r for r in results if r['status'] == 200]
+    shed = [r for r in results if r['status'] == 503]
+    latencies = [r['latency'] for r in ok]
+    ttfts = [r['ttft'] for r in ok if r['ttft'] is not None]
+
+    print(f"provider={app.config['LLM_PROVIDER']} endpoint={endpoint} clients={clients} "
+          f"max_concurrent={app.config['LLM_MAX_CONCURRENT']} max_queue={app.config['LLM_MAX_QUEUE']}")
+    print(f"  {len(results)} requests in {elapsed:.2f}s, {len(ok) / elapsed:.2f} ok/s, "
+          f"{len(shed)} shed (503), {len(results) - len(ok) - len(shed)} other errors")
+    if latencies:
+        print(f"  latency p50 {percentile(latencies, 0.5) * 1000:.0f} ms, "
+              f"p95 {percentile(latencies, 0.95) * 1000:.0f} ms, max {max(latencies) * 1000:.0f} ms")
+    if ttfts:
+        print(f"  ttft p50 {percentile(ttfts, 0.5) * 1000:.0f} ms, p95 {percentile(ttfts, 0.95) * 1000:.0f} ms")
+
+    from app.routes.chat import chat_service
+    print(f"  bulkhead {chat_service.bulkhead_stats()}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test the chat routes against the configured LLM provider")
+    parser.add_argument('--clients', type=int, default=16, help="concurrent clients")
+    parser.add_argument('--requests', type=int, default=5, help="requests per client")
+    parser.add_argument('--endpoint', choices=('chat', 'stream'), default='chat')
+    args = parser.parse_args()
+
+    benchmark(args.clients, args.requests, args.endpoint)
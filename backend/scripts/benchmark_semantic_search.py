@@ -0,0 +1,68 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.semantic_index import SemanticIndex
+
+WORDS = (
+    "learning deep neural network model training data gradient descent attention transformer "
+    "language vision image classification detection segmentation reinforcement agent policy reward "
+    "graph embedding representation generative adversarial diffusion autoencoder variational bayesian "
+    "inference probabilistic optimization convex stochastic regularization dropout batch normalization "
+    "convolution recurrent memory sequence translation speech audio robotics control planning search "
+    "tutorial course book paper library framework python tensor benchmark dataset evaluation metric"
+).split()
+
+
+def synthetic_documents(count, seed=0):
+    rng = random.Random(seed)
+    for doc_id in range(1, count + 1):
+        title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 8)))
+        description = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(15, 40)))
+        yield doc_id, f"{title} {title} {description}"
+
+
+def main(documents, queries, dim, k):
+    index = SemanticIndex(dim=dim)
+
+    started = time.perf_counter()
+    index.build(synthetic_documents(documents))
+    print(f"built {documents} documents x {dim} dims in {time.perf_counter() - started:.1f}s "
+          f"({index.matrix.nbytes / 1024 / 1024:.0f} MiB)")
+
+    rng = random.Random(1)
+    timings = []
+    for _ in range(queries):
+        text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 6)))
+        started = time.perf_counter()
+        index.query(text, k=k)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(f"top-{k} query: p50 {timings[len(timings) // 2] * 1000:.2f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95)] * 1000:.2f} ms, max {timings[-1] * 1000:.2f} ms")
+
+    started = time.perf_counter()
+    for doc_id, text in synthetic_documents(1000, seed=2):
+        index.upsert(documents + doc_id, text)
+    print(f"1000 incremental inserts: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    started = time.perf_counter()
+    for doc_id in range(1, 1001):
+        index.remove(doc_id)
+    print(f"1000 deletes: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure semantic index build, query and update times")
+    parser.add_argument('--documents', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--dim', type=int, default=256)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    main(args.documents, args.queries, args.dim, args.k)
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Throwaway database and no background jobs, so the numbers are only serialization
+_, DATABASE_PATH = tempfile.mkstemp(suffix='.db')
+os.environ['DATABASE_URL'] = f"sqlite:///{DATABASE_PATH}"
+os.environ.setdefault('TRENDING_REFRESH_INTERVAL', '0')
+
+from flask import jsonify
+from app import create_app
+from app.extensions import db
+from app.models import Resource, User
+from app.utils.serializers import json_response, resource_rows, resource_serializer
+
+CATEGORIES = ('Papers', 'Tutorials', 'Courses', 'Tools', 'Blogs & Forums')
+
+
+def populate(count, users=100, seed=0):
+    rng = random.Random(seed)
+    db.session.execute(User.__table__.insert(), [
+        {'id': i, 'username': f"user{i}", 'password_hash': 'x', 'role': 'user', 'is_admin': False}
+        for i in range(1, users + 1)
+    ])
+    started = datetime(2024, 1, 1)
+    rows = []
+    for i in range(1, count + 1):
+        created_at = started + timedelta(minutes=i)
+        rows.append({
+            'id': i,
+            'title': f"Resource {i} on {rng.choice(CATEGORIES).lower()}",
+            'description': ' '.join(rng.choice(('deep', 'learning', 'model', 'data', 'neural', 'training'))
+                                    for _ in range(rng.randint(20, 60))),
+            'url': f"https://example.com/resources/{i}",
+            'category': rng.choice(CATEGORIES),
+            'is_approved': True,
+            'created_at': created_at,
+            'updated_at': created_at,
+            # Some resources have no submitter, like imported ones
+            'submitter_id': rng.randint(1, users) if i % 10 else None
+        })
+    db.session.execute(Resource.__table__.insert(), rows)
+    db.session.commit()
+
+
+def orm_path():
+    resources = resource_serializer.apply(Resource.query.filter_by(is_approved=True)).order_by(
+        Resource.created_at.desc()
+    ).all()
+    return jsonify({'resources': resource_serializer.dump_many(resources)}).get_data()
+
+
+def row_path():
+    rows = resource_rows.project(Resource.query.filter_by(is_approved=True)).order_by(
+        Resource.created_at.desc()
+    ).all()
+    return json_response({'resources': resource_rows.dump_many(rows)}).get_data()
+
+
+def timed(fn, runs):
+    timings = []
+    for _ in range(runs):
+        # Fresh session each run, so the ORM path can't reuse objects from the identity map
+        db.session.remove()
+        started = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2], body
+
+
+def main(count, runs):
+    app = create_app()
+    try:
+        with app.app_context():
+            db.create_all()
+            populate(count)
+
+            with app.test_request_context():
+                orm_time, orm_body = timed(orm_path, runs)
+                row_time, row_body = timed(row_path, runs)
+
+            if json.loads(orm_body) != json.loads(row_body):
+                print("FAIL the two paths returned different resources")
+                return False
+
+            print(f"{count} resources, median of {runs} runs, {len(row_body) / 1024 / 1024:.1f} MiB of JSON")
+            print(f"  ORM + to_dict + jsonify:          {orm_time * 1000:7.1f} ms")
+            print(f"  columns + resource_rows + orjson: {row_time * 1000:7.1f} ms ({orm_time / row_time:.1f}x faster)")
+            return True
+    finally:
+        os.remove(DATABASE_PATH)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare the ORM and column-projection serializers on one large listing")
+    parser.add_argument('--resources', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    sys.exit(0 if main(args.resources, args.runs) else 1)
@@ -0,0 +1,110 @@
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Throwaway database seeded below, so the check never touches real data, and
+# no background jobs while measuring
+_, DATABASE_PATH = tempfile.mkstemp(suffix='.db')
+os.environ['DATABASE_URL'] = f"sqlite:///{DATABASE_PATH}"
+os.environ.setdefault('TRENDING_REFRESH_INTERVAL', '0')
+os.environ.setdefault('LLM_PROVIDER', 'local')
+
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models import Bookmark, Resource, User
+from app.routes.chat import recommendation_service
+from app.services.search_service import SearchService
+from app.utils.query_counter import count_queries
+
+# Most SQL statements each list endpoint may run for a page of results,
+# whatever the page size, including user lookups. Listing totals come from the
+# count cache, which the warm-up request fills.
+BUDGETS = {
+    '/api/resources/?per_page={n}': 1,
+    '/api/resources/?cursor=&per_page={n}': 1,
+    '/api/resources/pending?per_page={n}': 2,
+    '/api/bookmarks/?per_page={n}': 2,
+    '/api/bookmarks/?cursor=&per_page={n}': 2,
+    '/api/search/?q=learning&per_page={n}': 3,
+    '/api/search/semantic?q=deep+learning&limit={n}': 1,
+}
+
+PAGE_SIZES = (1, 5, 20, 50)
+
+CATEGORIES = ('Papers', 'Tutorials', 'Courses', 'Tools')
+
+
+def populate(resources=120):
+    """Enough rows that every listing fills the largest page size, with several submitters."""
+    submitters = [User(username=f"user{i}", is_admin=(i == 0)) for i in range(5)]
+    for user in submitters:
+        user.set_password('password')
+        db.session.add(user)
+    db.session.flush()
+
+    started = datetime(2024, 1, 1)
+    for i in range(resources):
+        db.session.add(Resource(
+            title=f"Deep learning resource {i}",
+            description=f"Notes on machine learning, part {i}",
+            url=f"https://example.com/resources/{i}",
+            category=CATEGORIES[i % len(CATEGORIES)],
+            # Every third one waits for approval, so /pending has pages too
+            is_approved=i % 3 != 0,
+            created_at=started + timedelta(minutes=i),
+            updated_at=started + timedelta(minutes=i),
+            submitter_id=submitters[i % len(submitters)].id
+        ))
+    db.session.flush()
+
+    admin = submitters[0]
+    for resource in Resource.query.limit(60):
+        db.session.add(Bookmark(user_id=admin.id, resource_id=resource.id))
+    db.session.commit()
+    return admin
+
+
+def check():
+    app = create_app()
+    client = app.test_client()
+
+    with app.app_context():
+        db.create_all()
+        SearchService().ensure_index()
+        admin = populate()
+        headers = {'Authorization': f"Bearer {create_access_token(identity=str(admin.id))}"}
+        engine = db.engine
+
+    # Warm up per-process state (FTS table lookup, semantic index, counts) before measuring
+    for url in BUDGETS:
+        client.get(url.format(n=1), headers=headers)
+
+    # Requests run outside our app context so each gets a fresh session, as in production
+    ok = True
+    for url, budget in BUDGETS.items():
+        counts = []
+        for n in PAGE_SIZES:
+            with count_queries(engine) as statements:
+                response = client.get(url.format(n=n), headers=headers)
+            counts.append(len(statements))
+            if response.status_code != 200:
+                print(f"  {url.format(n=n)} returned {response.status_code}")
+        status = 'ok' if max(counts) <= budget and len(set(counts)) == 1 else 'FAIL'
+        ok = ok and status == 'ok'
+        print(f"{status:4s} {url.split('?')[0]:28s} queries per page size {dict(zip(PAGE_SIZES, counts))} (budget {budget})")
+    return ok
+
+if __name__ == '__main__':
+    try:
+        ok = check()
+    finally:
+        # The seed bookmarks queue a recommendation job, let it finish with the database
+        if recommendation_service.executor is not None:
+            recommendation_service.executor.shutdown(wait=True)
+        os.remove(DATABASE_PATH)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,102 @@
+import os
+import sys
+from datetime import datetime
+from urllib.parse import quote
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# No background jobs while checking
+os.environ.setdefault('TRENDING_REFRESH_INTERVAL', '0')
+
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models import Resource, User
+from app.utils.pagination import encode_cursor
+from app.utils.query_counter import count_queries
+
+# Request, table its main query reads, and the index(es) that query must use.
+# sqlite_autoindex_* is how SQLite names the index behind a UNIQUE constraint.
+CHECKS = [
+    ('GET', '/api/resources/', 'resource', ('ix_resource_is_approved_created_at',)),
+    ('GET', '/api/resources/?category={category}', 'resource', ('ix_resource_is_approved_category_created_at',)),
+    ('GET', '/api/resources/pending', 'resource', ('ix_resource_is_approved_created_at',)),
+    ('GET', '/api/bookmarks/', 'bookmark', ('ix_bookmark_user_id_created_at',)),
+    # Keyset pages seek into the same indexes
+    ('GET', '/api/resources/?cursor={cursor}', 'resource', ('ix_resource_is_approved_created_at',)),
+    ('GET', '/api/resources/?category={category}&cursor={cursor}', 'resource', ('ix_resource_is_approved_category_created_at',)),
+    ('GET', '/api/bookmarks/?cursor={cursor}', 'bookmark', ('ix_bookmark_user_id_created_at',)),
+    # Looks the bookmark up by (user_id, resource_id) and 404s, nothing is deleted
+    ('DELETE', '/api/bookmarks/999999999', 'bookmark', ('uq_bookmark_user_id_resource_id', 'sqlite_autoindex_bookmark')),
+]
+
+
+def explain(connection, statement, parameters):
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+def main_query(statements, table):
+    """The first statement that selects rows from ``table`` (skipping user lookups and counts)."""
+    for statement, parameters in statements:
+        normalized = ' '.join(statement.split())
+        if f"FROM {table} " in normalized + ' ' and not normalized.startswith('SELECT count('):
+            return statement, parameters
+    return None, None
+
+
+def check():
+    app = create_app()
+    client = app.test_client()
+
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            print("EXPLAIN QUERY PLAN checks only run against SQLite")
+            return False
+        user = User.query.filter_by(is_admin=True).first()
+        if user is None:
+            print("No admin user in the database, run scripts/create_admin.py first")
+            return False
+        headers = {'Authorization': f"Bearer {create_access_token(identity=str(user.id))}"}
+        category = db.session.query(Resource.category).filter(Resource.category.isnot(None)).limit(1).scalar()
+        engine = db.engine
+
+    cursor = encode_cursor(datetime.utcnow(), 2 ** 31)
+    ok = True
+    for method, url, table, indexes in CHECKS:
+        url = url.format(category=quote(category or ''), cursor=cursor)
+        with count_queries(engine) as statements:
+            client.open(url, method=method, headers=headers)
+        statement, parameters = main_query(statements, table)
+        if statement is None:
+            print(f"FAIL {method} {url}: no query on {table}")
+            ok = False
+            continue
+
+        with engine.connect() as connection:
+            plan = explain(connection, statement, parameters)
+        uses_index = any(index in step for step in plan for index in indexes)
+        ok = ok and uses_index
+        print(f"{'ok' if uses_index else 'FAIL':4s} {method} {url}")
+        for step in plan:
+            print(f"       {step}")
+
+    # Not behind a route yet: the duplicate check in scripts/populate_db.py
+    with app.app_context():
+        query = Resource.query.filter_by(url='https://example.com').statement.compile(
+            db.engine, compile_kwargs={'literal_binds': True}
+        )
+        with db.engine.connect() as connection:
+            plan = explain(connection, str(query), ())
+    uses_index = any('ix_resource_url' in step for step in plan)
+    ok = ok and uses_index
+    print(f"{'ok' if uses_index else 'FAIL':4s} Resource lookup by url")
+    for step in plan:
+        print(f"       {step}")
+
+    return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check() else 1)
@@ -0,0 +1,33 @@
+import argparse
+import os
+import sys
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.services.arxiv_service import ArxivService
+from app.services.github_service import GitHubService
+from app.services.ingestion_service import IngestionService
+
+def ingest(arxiv_total, github_pages):
+    app = create_app()
+    
+    with app.app_context():
+        service = IngestionService(GitHubService(), ArxivService())
+        
+        if arxiv_total:
+            count = service.ingest_arxiv(total=arxiv_total)
+            print(f"Mirrored {count} arXiv papers")
+        
+        if github_pages:
+            count = service.ingest_github(pages=github_pages)
+            print(f"Mirrored {count} GitHub repositories")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mirror AI papers and repositories into the local database")
+    parser.add_argument('--arxiv', type=int, default=1000, help="number of newest arXiv papers to pull (0 to skip)")
+    parser.add_argument('--github-pages', type=int, default=2, help="pages of 100 repositories per topic (0 to skip)")
+    args = parser.parse_args()
+    
+    ingest(args.arxiv, args.github_pages)
@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app import create_app
 from app.extensions import db
 from app.models import Resource
+from app.services.search_service import SearchService
 
 def populate_database():
     app = create_app()
@@ -16,6 +17,7 @@ def populate_database():
     with app.app_context():
         # Create database tables
         db.create_all()
+        SearchService().ensure_index()
         
         # Read initial resources
         with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'latest_resources.json')) as f:
@@ -11,7 +11,6 @@ import {
 } from '@mui/material';
 import { Send as SendIcon } from '@mui/icons-material';
 import ReactMarkdown from 'react-markdown';
-import axios from '../utils/axios';
 
 const Message = ({ content, isUser }) => (
   <Box
@@ -95,6 +94,9 @@ const AIChat = () => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const messagesEndRef = useRef(null);
+  const abortRef = useRef(null);
+  // The conversation lives on the server, each request only carries the new message
+  const sessionIdRef = useRef(null);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -104,6 +106,50 @@ const AIChat = () => {
     scrollToBottom();
   }, [messages]);
 
+  // Abort an in-flight reply when leaving the page so the server stops generating
+  useEffect(() => () => abortRef.current?.abort(), []);
+
+  // Reads the SSE reply from /api/chat/stream and calls onEvent for each message
+  const streamReply = async (body, onEvent) => {
+    const baseURL = process.env.REACT_APP_API_URL || 'http://localhost:5000';
+    abortRef.current = new AbortController();
+    const response = await fetch(`${baseURL}/api/chat/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        Authorization: `Bearer ${localStorage.getItem('token')}`
+      },
+      credentials: 'include',
+      body: JSON.stringify(body),
+      signal: abortRef.current.signal
+    });
+    if (response.status === 401) {
+      // Same handling as the axios response interceptor
+      localStorage.removeItem('token');
+      window.location.href = '/login';
+      return;
+    }
+    if (!response.ok || !response.body) {
+      throw new Error(`Chat stream failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const events = buffer.split('\n\n');
+      buffer = events.pop();
+      events.forEach((raw) => {
+        const event = raw.match(/^event: (.*)$/m)?.[1];
+        const data = raw.match(/^data: (.*)$/m)?.[1];
+        if (event && data) onEvent(event, JSON.parse(data));
+      });
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     if (!input.trim()) return;
@@ -115,27 +161,34 @@ const AIChat = () => {
     setError(null);
 
     try {
-      // Convert messages to conversation history format
-      const conversationHistory = messages.map(msg => ({
-        role: msg.isUser ? 'user' : 'assistant',
-        content: msg.content
-      }));
-
-      const response = await axios.post('/api/chat', {
+      let started = false;
+      await streamReply({
         message: userMessage,
-        conversation_history: conversationHistory
-      }, {
-        withCredentials: true,
-        headers: {
-          'Content-Type': 'application/json',
-          'Accept': 'application/json'
+        session_id: sessionIdRef.current
+      }, (event, data) => {
+        if (event === 'session') {
+          sessionIdRef.current = data.session_id;
+        } else if (event === 'token') {
+          // Start the assistant message with the first chunk, then grow it
+          if (!started) {
+            started = true;
+            setLoading(false);
+            setMessages(prev => [...prev, { content: data.text, isUser: false }]);
+          } else {
+            setMessages(prev => [
+              ...prev.slice(0, -1),
+              { ...prev[prev.length - 1], content: prev[prev.length - 1].content + data.text }
+            ]);
+          }
+        } else if (event === 'error') {
+          setError('Failed to get response from AI. Please try again.');
         }
       });
-
-      setMessages(prev => [...prev, { content: response.data.reply, isUser: false }]);
     } catch (err) {
-      setError('Failed to get response from AI. Please try again.');
-      console.error('Chat error:', err);
+      if (err.name !== 'AbortError') {
+        setError('Failed to get response from AI. Please try again.');
+        console.error('Chat error:', err);
+      }
     } finally {
       setLoading(false);
     }
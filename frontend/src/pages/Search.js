@@ -162,12 +162,72 @@ const Search = () => {
     }
   };
 
+  // Reads /api/search/all/stream and calls onSection for every source as it arrives
+  const streamSearch = async (searchQuery, onSection) => {
+    const baseURL = process.env.REACT_APP_API_URL || 'http://localhost:5000';
+    const response = await fetch(
+      `${baseURL}/api/search/all/stream?q=${encodeURIComponent(searchQuery)}&format=ndjson`,
+      {
+        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
+        credentials: 'include'
+      }
+    );
+    if (!response.ok || !response.body) {
+      throw new Error(`Search stream failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      lines.filter((line) => line.trim()).forEach((line) => onSection(JSON.parse(line)));
+    }
+  };
+
+  const handleStreamingSearch = async () => {
+    setResults({ local: [], external: [] });
+
+    await streamSearch(query, (section) => {
+      if (section.source === 'done') return;
+
+      if (section.status !== 'ok') {
+        const label = section.source === 'github' ? 'GitHub' : section.source === 'arxiv' ? 'arXiv' : 'Local';
+        console.error(`${label} search ${section.status}:`, section.error);
+      }
+
+      const items = section.data?.items || [];
+      setResults((prev) => section.source === 'local'
+        ? { ...prev, local: items }
+        : { ...prev, external: [...prev.external, ...items] });
+
+      // Show results as soon as the first source is in
+      setLoading(false);
+    });
+  };
+
   const handleSearch = async () => {
     if (!query.trim()) return;
 
     setLoading(true);
     setError(null);
 
+    // Logged in users get results source by source from the streaming endpoint
+    if (user) {
+      try {
+        await handleStreamingSearch();
+        setLoading(false);
+        return;
+      } catch (err) {
+        // Fall back to querying each source separately below
+        console.error('Streaming search error, falling back:', err);
+      }
+    }
+
     try {
       // Search both local and external sources simultaneously
       const [localRes, githubRes, arxivRes] = await Promise.allSettled([